@@ -27,8 +27,9 @@ class CriticAgent:
         Returns:
             Papers with critique scores and analysis
         """
-        dimensions = self.genome.get("critique_focus", {}).get("dimensions", [])
-        weights = self.genome.get("critique_focus", {}).get("weights", {})
+        critique_focus = self.genome.get("critique_focus", {})
+        dimensions = critique_focus.get("dimensions", [])
+        weights = critique_focus.get("weights", {})
         
         critiqued_papers = []
         for paper in papers:
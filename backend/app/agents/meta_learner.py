@@ -103,7 +103,8 @@ class MetaLearnerAgent:
         current_keywords = genome.get("retrieval_preferences", {}).get("keywords", [])
         
         # Add 1-2 keywords from winner if not already present
-        new_keywords = [kw for kw in winning_keywords if kw not in current_keywords][:2]
+        present = set(current_keywords)
+        new_keywords = [kw for kw in winning_keywords if kw not in present][:2]
         if new_keywords:
             genome["retrieval_preferences"]["keywords"].extend(new_keywords)
             changes.append(f"Added keywords: {', '.join(new_keywords)}")
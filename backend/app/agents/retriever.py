@@ -27,8 +27,9 @@ class RetrieverAgent:
             List of research papers/methods
         """
         # Extract search parameters from genome
-        year_window = self.genome.get("retrieval_preferences", {}).get("year_window", [2018, 2024])
-        venue_weights = self.genome.get("retrieval_preferences", {}).get("venue_weights", {})
+        preferences = self.genome.get("retrieval_preferences", {})
+        year_window = preferences.get("year_window", [2018, 2024])
+        venue_weights = preferences.get("venue_weights", {})
         keywords = research_plan.get("keywords", [])
         
         # Mock retrieval - return hardcoded papers based on lab focus
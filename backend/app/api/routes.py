@@ -2,9 +2,9 @@
 FastAPI routes for AutoLab Drive.
 """
 import os
-import shutil
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Form
 from fastapi.responses import FileResponse
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pathlib import Path
@@ -21,7 +21,6 @@ from app.schemas.genome import GenomeResponse, GenomeEvolutionResponse
 from app.services.dataset_ingestion import DatasetIngestionService
 from app.services.event_detector import EventDetectorService
 from app.services.research_lab import ResearchLabOrchestrator
-from app.config import settings
 
 router = APIRouter()
 
@@ -45,17 +44,11 @@ async def upload_dataset(
     if not file.filename.endswith('.zip'):
         raise HTTPException(status_code=400, detail="Only ZIP files are accepted")
     
-    # Save uploaded file temporarily
-    temp_path = Path(settings.storage_path) / "temp" / file.filename
-    temp_path.parent.mkdir(parents=True, exist_ok=True)
-    
     try:
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Ingest dataset
+        # Ingest dataset straight from the upload's spooled file, without
+        # copying it to a temporary ZIP first
         upload_path, frames_path, telemetry_path, frame_count, duration = \
-            dataset_service.ingest_dataset(str(temp_path), name)
+            dataset_service.ingest_dataset(file.file, name)
         
         # Validate telemetry CSV
         dataset_service.validate_telemetry_csv(telemetry_path)
@@ -79,10 +72,12 @@ async def upload_dataset(
         telemetry_df = dataset_service.get_telemetry_dataframe(telemetry_path)
         detected_events = event_detector.detect_events(telemetry_df)
         
-        # Store events in database
-        for event_data in detected_events:
-            event = Event(dataset_id=dataset.id, **event_data)
-            db.add(event)
+        # Store events in database (one batched INSERT, no per-event ORM objects)
+        if detected_events:
+            db.execute(
+                insert(Event),
+                [dict(event_data, dataset_id=dataset.id) for event_data in detected_events]
+            )
         
         db.commit()
         
@@ -90,10 +85,6 @@ async def upload_dataset(
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to process dataset: {str(e)}")
-    finally:
-        # Clean up temp file
-        if temp_path.exists():
-            temp_path.unlink()
 
 
 @router.get("/api/datasets", response_model=List[DatasetResponse])
@@ -120,17 +111,16 @@ def delete_dataset(dataset_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Dataset not found")
     
     try:
-        # Delete associated analyses first (they reference events)
-        event_ids = [event.id for event in db.query(Event).filter(Event.dataset_id == dataset_id).all()]
-        if event_ids:
-            db.query(Analysis).filter(Analysis.event_id.in_(event_ids)).delete(synchronize_session=False)
+        # Delete associated analyses first (they reference events); the
+        # event ids are selected inside the DELETE rather than loaded here
+        event_ids = select(Event.id).where(Event.dataset_id == dataset_id)
+        db.query(Analysis).filter(Analysis.event_id.in_(event_ids)).delete(synchronize_session=False)
         
         # Delete associated events
         db.query(Event).filter(Event.dataset_id == dataset_id).delete()
         
         # Delete dataset files from storage
-        if os.path.exists(dataset.upload_path):
-            shutil.rmtree(dataset.upload_path)
+        dataset_service.cleanup_dataset(dataset.upload_path)
         
         # Delete database record
         db.delete(dataset)
@@ -355,10 +345,14 @@ def get_frame(dataset_id: int, frame_number: int, db: Session = Depends(get_db))
     frame_filename = f"frame_{frame_number:06d}.jpg"
     frame_path = Path(dataset.frames_path) / frame_filename
     
-    if not frame_path.exists():
+    # Stat once here and hand the result to FileResponse, which would
+    # otherwise stat the file again
+    try:
+        frame_stat = os.stat(frame_path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Frame not found")
     
-    return FileResponse(frame_path, media_type="image/jpeg")
+    return FileResponse(frame_path, media_type="image/jpeg", stat_result=frame_stat)
 
 
 @router.get("/api/health")
@@ -2,14 +2,36 @@
 Dataset ingestion service.
 Handles ZIP extraction, CSV parsing, and storage.
 """
+import importlib.util
 import os
 import zipfile
 import shutil
 import pandas as pd
-from pathlib import Path
-from typing import Tuple, Optional
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, List, Tuple, Optional, Union
 from app.config import settings
 
+# Multithreaded CSV tokenizer, used by pandas when pyarrow is installed.
+# pyarrow is optional and not in requirements.txt, so the default image uses 'c'.
+CSV_ENGINE = 'pyarrow' if importlib.util.find_spec('pyarrow') is not None else 'c'
+
+
+# Frame image types counted at ingestion
+FRAME_SUFFIXES = frozenset({'.jpg', '.png'})
+
+# Numeric telemetry columns, parsed straight to float64 instead of inferred
+TELEMETRY_DTYPES = {
+    'timestamp': 'float64',
+    'ego_speed_mps': 'float64',
+    'ego_yaw': 'float64',
+    'lead_distance_m': 'float64',
+}
+
+
+def read_telemetry_csv(csv_path, **kwargs) -> pd.DataFrame:
+    """Read a telemetry CSV with the fastest available pandas parser"""
+    return pd.read_csv(csv_path, engine=CSV_ENGINE, **kwargs)
+
 
 class DatasetIngestionService:
     def __init__(self):
@@ -24,14 +46,14 @@ class DatasetIngestionService:
     
     def ingest_dataset(
         self, 
-        zip_file_path: str, 
+        zip_file_path: Union[str, BinaryIO], 
         dataset_name: str
     ) -> Tuple[str, str, str, int, int]:
         """
         Extract and process uploaded dataset.
         
         Args:
-            zip_file_path: Path to uploaded ZIP file
+            zip_file_path: Path to uploaded ZIP file, or a seekable binary file object holding it
             dataset_name: Name for the dataset
             
         Returns:
@@ -41,25 +63,34 @@ class DatasetIngestionService:
         dataset_dir = self.datasets_path / dataset_name
         dataset_dir.mkdir(parents=True, exist_ok=True)
         
-        # Extract ZIP
+        # Extract ZIP, keeping the member list so the extracted tree
+        # does not have to be scanned again
         with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
+            # Member names as extracted (extractall drops a leading '/')
+            members = [name.lstrip('/') for name in zip_ref.namelist()]
             zip_ref.extractall(dataset_dir)
         
         # Find frames directory and telemetry CSV
-        frames_dir = self._find_frames_directory(dataset_dir)
-        telemetry_csv = self._find_telemetry_csv(dataset_dir)
+        frames_parts = self._find_frames_directory(members)
+        telemetry_parts = self._find_telemetry_csv(members)
         
-        if not frames_dir:
+        if not frames_parts:
             raise ValueError("No 'frames' directory found in uploaded ZIP")
-        if not telemetry_csv:
+        if not telemetry_parts:
             raise ValueError("No 'telemetry.csv' file found in uploaded ZIP")
         
+        frames_dir = dataset_dir.joinpath(*frames_parts)
+        telemetry_csv = dataset_dir.joinpath(*telemetry_parts)
+        
         # Count frames
-        frame_files = list(frames_dir.glob("*.jpg")) + list(frames_dir.glob("*.png"))
-        frame_count = len(frame_files)
+        frame_count = 0
+        for name in members:
+            member = PurePosixPath(name)
+            if member.parent.parts == frames_parts and member.suffix in FRAME_SUFFIXES:
+                frame_count += 1
         
-        # Parse telemetry to get duration
-        df = pd.read_csv(telemetry_csv)
+        # Parse telemetry to get duration (only the timestamp column is needed)
+        df = read_telemetry_csv(telemetry_csv, usecols=['timestamp'])
         if len(df) > 0:
             duration_seconds = int(df['timestamp'].max())
         else:
@@ -73,33 +104,28 @@ class DatasetIngestionService:
             duration_seconds
         )
     
-    def _find_frames_directory(self, dataset_dir: Path) -> Optional[Path]:
-        """Find frames directory in extracted dataset"""
-        # Look for 'frames' directory
-        frames_dir = dataset_dir / "frames"
-        if frames_dir.exists() and frames_dir.is_dir():
-            return frames_dir
-        
-        # Search recursively
-        for path in dataset_dir.rglob("frames"):
-            if path.is_dir():
-                return path
+    def _find_frames_directory(self, members: List[str]) -> Optional[Tuple[str, ...]]:
+        """Find frames directory among the ZIP member paths"""
+        # Directories named 'frames' anywhere in the archive; entries for the
+        # directories themselves are optional in ZIPs, so use member parents
+        candidates = set()
+        for name in members:
+            member = PurePosixPath(name)
+            parts = member.parts if name.endswith('/') else member.parent.parts
+            if 'frames' in parts:
+                candidates.add(parts[:parts.index('frames') + 1])
         
-        return None
+        # Prefer 'frames' in root, then the shallowest match
+        return min(candidates, key=lambda parts: (len(parts), parts), default=None)
     
-    def _find_telemetry_csv(self, dataset_dir: Path) -> Optional[Path]:
-        """Find telemetry.csv in extracted dataset"""
-        # Look for 'telemetry.csv' in root
-        telemetry_csv = dataset_dir / "telemetry.csv"
-        if telemetry_csv.exists():
-            return telemetry_csv
-        
-        # Search recursively
-        for path in dataset_dir.rglob("telemetry.csv"):
-            if path.is_file():
-                return path
-        
-        return None
+    def _find_telemetry_csv(self, members: List[str]) -> Optional[Tuple[str, ...]]:
+        """Find telemetry.csv among the ZIP member paths"""
+        # Prefer 'telemetry.csv' in root, then the shallowest match
+        candidates = [
+            PurePosixPath(name).parts for name in members
+            if not name.endswith('/') and PurePosixPath(name).name == 'telemetry.csv'
+        ]
+        return min(candidates, key=lambda parts: (len(parts), parts), default=None)
     
     def validate_telemetry_csv(self, csv_path: str) -> bool:
         """
@@ -123,8 +149,9 @@ class DatasetIngestionService:
         ]
         
         try:
-            df = pd.read_csv(csv_path)
-            missing_columns = set(required_columns) - set(df.columns)
+            # Header row only; the rows are parsed when the dataframe is loaded
+            header = pd.read_csv(csv_path, nrows=0)
+            missing_columns = set(required_columns) - set(header.columns)
             
             if missing_columns:
                 raise ValueError(f"Missing required columns: {missing_columns}")
@@ -135,7 +162,7 @@ class DatasetIngestionService:
     
     def get_telemetry_dataframe(self, csv_path: str) -> pd.DataFrame:
         """Load telemetry CSV as pandas DataFrame"""
-        return pd.read_csv(csv_path)
+        return read_telemetry_csv(csv_path, dtype=TELEMETRY_DTYPES)
     
     def cleanup_dataset(self, dataset_path: str):
         """Remove dataset directory and all its contents"""
@@ -2,11 +2,16 @@
 Event detection service.
 Analyzes telemetry data to detect scenario events.
 """
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Any
 from app.models.event import EventType
 
 
+# Weather conditions that make an adverse-weather event high severity
+SEVERE_WEATHER = frozenset({'heavy_rain', 'snow', 'fog'})
+
+
 class EventDetectorService:
     """
     Detects scenario events from telemetry data using rule-based heuristics.
@@ -33,11 +38,18 @@ class EventDetectorService:
         Returns:
             List of event dictionaries with metadata
         """
+        if telemetry_df.empty:
+            return []
+        
         events = []
         
+        # Plain per-row dicts, indexed by position, for building event records
+        rows = telemetry_df.to_dict('records')
+        
         # Detect cut-in events
         events.extend(self._detect_flag_events(
             telemetry_df, 
+            rows,
             'cut_in_flag', 
             EventType.CUT_IN,
             "Vehicle cut-in detected"
@@ -46,22 +58,23 @@ class EventDetectorService:
         # Detect pedestrian events
         events.extend(self._detect_flag_events(
             telemetry_df, 
+            rows,
             'pedestrian_flag', 
             EventType.PEDESTRIAN,
             "Pedestrian detected"
         ))
         
         # Detect adverse weather
-        events.extend(self._detect_adverse_weather(telemetry_df))
+        events.extend(self._detect_adverse_weather(telemetry_df, rows))
         
         # Detect close following
-        events.extend(self._detect_close_following(telemetry_df))
+        events.extend(self._detect_close_following(telemetry_df, rows))
         
         # Detect sudden braking
-        events.extend(self._detect_sudden_brake(telemetry_df))
+        events.extend(self._detect_sudden_brake(telemetry_df, rows))
         
         # Detect lane changes
-        events.extend(self._detect_lane_change(telemetry_df))
+        events.extend(self._detect_lane_change(telemetry_df, rows))
         
         # Sort events by timestamp
         events.sort(key=lambda x: x['start_timestamp'])
@@ -71,6 +84,7 @@ class EventDetectorService:
     def _detect_flag_events(
         self, 
         df: pd.DataFrame, 
+        rows: List[Dict[str, Any]],
         flag_column: str, 
         event_type: EventType,
         description: str
@@ -82,12 +96,12 @@ class EventDetectorService:
         flag_series = df[flag_column] == 1
         
         # Find start and end of each sequence
-        start_indices = df.index[flag_series & ~flag_series.shift(1, fill_value=False)]
-        end_indices = df.index[flag_series & ~flag_series.shift(-1, fill_value=False)]
+        start_indices = np.flatnonzero(flag_series & ~flag_series.shift(1, fill_value=False))
+        end_indices = np.flatnonzero(flag_series & ~flag_series.shift(-1, fill_value=False))
         
         for start_idx, end_idx in zip(start_indices, end_indices):
-            start_row = df.loc[start_idx]
-            end_row = df.loc[end_idx]
+            start_row = rows[start_idx]
+            end_row = rows[end_idx]
             
             # Check minimum duration
             duration = end_row['timestamp'] - start_row['timestamp']
@@ -110,19 +124,19 @@ class EventDetectorService:
         
         return events
     
-    def _detect_adverse_weather(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _detect_adverse_weather(self, df: pd.DataFrame, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Detect adverse weather conditions"""
         events = []
         
         # Find sequences where weather is not 'clear'
         adverse_weather = df['weather'] != 'clear'
         
-        start_indices = df.index[adverse_weather & ~adverse_weather.shift(1, fill_value=False)]
-        end_indices = df.index[adverse_weather & ~adverse_weather.shift(-1, fill_value=False)]
+        start_indices = np.flatnonzero(adverse_weather & ~adverse_weather.shift(1, fill_value=False))
+        end_indices = np.flatnonzero(adverse_weather & ~adverse_weather.shift(-1, fill_value=False))
         
         for start_idx, end_idx in zip(start_indices, end_indices):
-            start_row = df.loc[start_idx]
-            end_row = df.loc[end_idx]
+            start_row = rows[start_idx]
+            end_row = rows[end_idx]
             
             duration = end_row['timestamp'] - start_row['timestamp']
             if duration >= self.min_event_duration:
@@ -139,24 +153,24 @@ class EventDetectorService:
                     'cut_in_flag': bool(start_row['cut_in_flag']),
                     'pedestrian_flag': bool(start_row['pedestrian_flag']),
                     'description': f"Adverse weather: {start_row['weather']}",
-                    'severity': 'high' if start_row['weather'] in ['heavy_rain', 'snow', 'fog'] else 'medium'
+                    'severity': 'high' if start_row['weather'] in SEVERE_WEATHER else 'medium'
                 })
         
         return events
     
-    def _detect_close_following(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _detect_close_following(self, df: pd.DataFrame, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Detect close following scenarios"""
         events = []
         
         # Find sequences where lead distance < threshold
         close_following = df['lead_distance_m'] < self.close_following_threshold
         
-        start_indices = df.index[close_following & ~close_following.shift(1, fill_value=False)]
-        end_indices = df.index[close_following & ~close_following.shift(-1, fill_value=False)]
+        start_indices = np.flatnonzero(close_following & ~close_following.shift(1, fill_value=False))
+        end_indices = np.flatnonzero(close_following & ~close_following.shift(-1, fill_value=False))
         
         for start_idx, end_idx in zip(start_indices, end_indices):
-            start_row = df.loc[start_idx]
-            end_row = df.loc[end_idx]
+            start_row = rows[start_idx]
+            end_row = rows[end_idx]
             
             duration = end_row['timestamp'] - start_row['timestamp']
             if duration >= self.min_event_duration:
@@ -178,71 +192,71 @@ class EventDetectorService:
         
         return events
     
-    def _detect_sudden_brake(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _detect_sudden_brake(self, df: pd.DataFrame, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Detect sudden braking events"""
         events = []
         
         # Calculate speed change
-        df['speed_change'] = df['ego_speed_mps'].diff()
-        
-        # Find sudden drops in speed
-        for i in range(1, len(df)):
-            if df.loc[i, 'speed_change'] < -self.sudden_brake_threshold:
-                # Found sudden brake
-                start_row = df.loc[i-1]
-                end_row = df.loc[i]
-                
-                events.append({
-                    'event_type': EventType.SUDDEN_BRAKE,
-                    'start_frame_id': start_row['frame_id'],
-                    'end_frame_id': end_row['frame_id'],
-                    'start_timestamp': float(start_row['timestamp']),
-                    'end_timestamp': float(end_row['timestamp']),
-                    'ego_speed_mps': float(start_row['ego_speed_mps']),
-                    'road_type': start_row['road_type'],
-                    'weather': start_row['weather'],
-                    'lead_distance_m': float(start_row['lead_distance_m']) if pd.notna(start_row['lead_distance_m']) else None,
-                    'cut_in_flag': bool(start_row['cut_in_flag']),
-                    'pedestrian_flag': bool(start_row['pedestrian_flag']),
-                    'description': f"Sudden brake: {abs(df.loc[i, 'speed_change']):.1f} m/s deceleration",
-                    'severity': 'high'
-                })
+        speed_change = df['ego_speed_mps'].diff().to_numpy()
+        
+        # Find sudden drops in speed (the leading NaN never matches)
+        for i in np.flatnonzero(speed_change < -self.sudden_brake_threshold):
+            # Found sudden brake
+            start_row = rows[i-1]
+            end_row = rows[i]
+            
+            events.append({
+                'event_type': EventType.SUDDEN_BRAKE,
+                'start_frame_id': start_row['frame_id'],
+                'end_frame_id': end_row['frame_id'],
+                'start_timestamp': float(start_row['timestamp']),
+                'end_timestamp': float(end_row['timestamp']),
+                'ego_speed_mps': float(start_row['ego_speed_mps']),
+                'road_type': start_row['road_type'],
+                'weather': start_row['weather'],
+                'lead_distance_m': float(start_row['lead_distance_m']) if pd.notna(start_row['lead_distance_m']) else None,
+                'cut_in_flag': bool(start_row['cut_in_flag']),
+                'pedestrian_flag': bool(start_row['pedestrian_flag']),
+                'description': f"Sudden brake: {abs(speed_change[i]):.1f} m/s deceleration",
+                'severity': 'high'
+            })
         
         return events
     
-    def _detect_lane_change(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _detect_lane_change(self, df: pd.DataFrame, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Detect lane change events"""
         events = []
         
         # Calculate yaw change over 2-second window
         window_size = 20  # Assuming 10 Hz sampling rate
         
-        for i in range(window_size, len(df)):
-            yaw_change = abs(df.loc[i, 'ego_yaw'] - df.loc[i-window_size, 'ego_yaw'])
+        yaw = df['ego_yaw'].to_numpy()
+        yaw_changes = np.abs(yaw[window_size:] - yaw[:-window_size])
+        
+        for i in np.flatnonzero(yaw_changes > self.lane_change_yaw_threshold) + window_size:
+            yaw_change = yaw_changes[i-window_size]
+            start_row = rows[i-window_size]
+            end_row = rows[i]
             
-            if yaw_change > self.lane_change_yaw_threshold:
-                start_row = df.loc[i-window_size]
-                end_row = df.loc[i]
-                
-                events.append({
-                    'event_type': EventType.LANE_CHANGE,
-                    'start_frame_id': start_row['frame_id'],
-                    'end_frame_id': end_row['frame_id'],
-                    'start_timestamp': float(start_row['timestamp']),
-                    'end_timestamp': float(end_row['timestamp']),
-                    'ego_speed_mps': float(start_row['ego_speed_mps']),
-                    'road_type': start_row['road_type'],
-                    'weather': start_row['weather'],
-                    'lead_distance_m': float(start_row['lead_distance_m']) if pd.notna(start_row['lead_distance_m']) else None,
-                    'cut_in_flag': bool(start_row['cut_in_flag']),
-                    'pedestrian_flag': bool(start_row['pedestrian_flag']),
-                    'description': f"Lane change: {yaw_change:.1f}° yaw change",
-                    'severity': 'low'
-                })
+            events.append({
+                'event_type': EventType.LANE_CHANGE,
+                'start_frame_id': start_row['frame_id'],
+                'end_frame_id': end_row['frame_id'],
+                'start_timestamp': float(start_row['timestamp']),
+                'end_timestamp': float(end_row['timestamp']),
+                'ego_speed_mps': float(start_row['ego_speed_mps']),
+                'road_type': start_row['road_type'],
+                'weather': start_row['weather'],
+                'lead_distance_m': float(start_row['lead_distance_m']) if pd.notna(start_row['lead_distance_m']) else None,
+                'cut_in_flag': bool(start_row['cut_in_flag']),
+                'pedestrian_flag': bool(start_row['pedestrian_flag']),
+                'description': f"Lane change: {yaw_change:.1f}° yaw change",
+                'severity': 'low'
+            })
         
         return events
     
-    def _calculate_severity(self, row: pd.Series) -> str:
+    def _calculate_severity(self, row: Dict[str, Any]) -> str:
         """Calculate event severity based on context"""
         severity_score = 0
         
@@ -39,7 +39,7 @@ class ResearchLab:
         Returns:
             Lab output with synthesis and intermediate results
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # Step 1: Planning
         research_plan = self.planner.plan(event_data)
@@ -56,7 +56,7 @@ class ResearchLab:
         # Step 5: Synthesis
         synthesis = self.synthesizer.synthesize(research_plan, critiqued_papers, event_data)
         
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         
         return {
             "lab_name": self.lab_name,
@@ -94,7 +94,7 @@ class ResearchLabOrchestrator:
         Returns:
             Complete analysis results
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # Initialize labs
         safety_lab = ResearchLab("SafetyLab", safety_genome)
@@ -124,7 +124,7 @@ class ResearchLabOrchestrator:
             event_data
         )
         
-        total_duration = time.time() - start_time
+        total_duration = time.perf_counter() - start_time
         
         return {
             "safety_lab_output": safety_output,
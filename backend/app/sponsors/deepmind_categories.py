@@ -44,6 +44,64 @@ class MethodCategory(str, Enum):
     OTHER = "other"
 
 
+def _categorize_text(text: str) -> MethodCategory:
+    """Keyword cascade behind DeepMindCategorizer.categorize_method."""
+    
+    # RL categories
+    if "reinforcement learning" in text or "rl" in text:
+        if "model-based" in text or "world model" in text:
+            return MethodCategory.RL_MODEL_BASED
+        elif "offline" in text or "batch" in text:
+            return MethodCategory.RL_OFFLINE
+        elif "safe" in text or "constrained" in text:
+            return MethodCategory.RL_SAFE
+        else:
+            return MethodCategory.RL_MODEL_FREE
+    
+    # Imitation learning
+    if "imitation" in text or "demonstration" in text:
+        if "inverse" in text:
+            return MethodCategory.IMITATION_INVERSE_RL
+        elif "gail" in text or "adversarial" in text:
+            return MethodCategory.IMITATION_GAIL
+        else:
+            return MethodCategory.IMITATION_BEHAVIORAL_CLONING
+    
+    # Control
+    if "mpc" in text or "model predictive" in text:
+        return MethodCategory.CONTROL_MODEL_PREDICTIVE
+    if "optimal control" in text or "lqr" in text:
+        return MethodCategory.CONTROL_OPTIMAL
+    if "robust control" in text or "h-infinity" in text:
+        return MethodCategory.CONTROL_ROBUST
+    
+    # Perception
+    if "perception" in text or "detection" in text or "segmentation" in text:
+        if "multi-modal" in text or "fusion" in text:
+            return MethodCategory.PERCEPTION_MULTI_MODAL
+        elif "3d" in text or "point cloud" in text:
+            return MethodCategory.PERCEPTION_3D
+        else:
+            return MethodCategory.PERCEPTION_DEEP_LEARNING
+    
+    # End-to-end
+    if "end-to-end" in text or "e2e" in text:
+        if "differentiable" in text:
+            return MethodCategory.END_TO_END_DIFFERENTIABLE
+        else:
+            return MethodCategory.END_TO_END_LEARNING
+    
+    # Safety & verification
+    if "verification" in text or "formal methods" in text:
+        return MethodCategory.SAFETY_VERIFICATION
+    if "shield" in text or "safety layer" in text:
+        return MethodCategory.SAFETY_SHIELDING
+    if "uncertainty" in text or "bayesian" in text:
+        return MethodCategory.UNCERTAINTY_ESTIMATION
+    
+    return MethodCategory.OTHER
+
+
 class DeepMindCategorizer:
     """
     Categorizes autonomous driving methods using DeepMind-inspired taxonomy.
@@ -61,61 +119,8 @@ class DeepMindCategorizer:
         Returns:
             MethodCategory enum
         """
-        text = (method_description + " " + paper_title).lower()
-        
-        # RL categories
-        if "reinforcement learning" in text or "rl" in text:
-            if "model-based" in text or "world model" in text:
-                return MethodCategory.RL_MODEL_BASED
-            elif "offline" in text or "batch" in text:
-                return MethodCategory.RL_OFFLINE
-            elif "safe" in text or "constrained" in text:
-                return MethodCategory.RL_SAFE
-            else:
-                return MethodCategory.RL_MODEL_FREE
-        
-        # Imitation learning
-        if "imitation" in text or "demonstration" in text:
-            if "inverse" in text:
-                return MethodCategory.IMITATION_INVERSE_RL
-            elif "gail" in text or "adversarial" in text:
-                return MethodCategory.IMITATION_GAIL
-            else:
-                return MethodCategory.IMITATION_BEHAVIORAL_CLONING
-        
-        # Control
-        if "mpc" in text or "model predictive" in text:
-            return MethodCategory.CONTROL_MODEL_PREDICTIVE
-        if "optimal control" in text or "lqr" in text:
-            return MethodCategory.CONTROL_OPTIMAL
-        if "robust control" in text or "h-infinity" in text:
-            return MethodCategory.CONTROL_ROBUST
-        
-        # Perception
-        if "perception" in text or "detection" in text or "segmentation" in text:
-            if "multi-modal" in text or "fusion" in text:
-                return MethodCategory.PERCEPTION_MULTI_MODAL
-            elif "3d" in text or "point cloud" in text:
-                return MethodCategory.PERCEPTION_3D
-            else:
-                return MethodCategory.PERCEPTION_DEEP_LEARNING
-        
-        # End-to-end
-        if "end-to-end" in text or "e2e" in text:
-            if "differentiable" in text:
-                return MethodCategory.END_TO_END_DIFFERENTIABLE
-            else:
-                return MethodCategory.END_TO_END_LEARNING
-        
-        # Safety & verification
-        if "verification" in text or "formal methods" in text:
-            return MethodCategory.SAFETY_VERIFICATION
-        if "shield" in text or "safety layer" in text:
-            return MethodCategory.SAFETY_SHIELDING
-        if "uncertainty" in text or "bayesian" in text:
-            return MethodCategory.UNCERTAINTY_ESTIMATION
-        
-        return MethodCategory.OTHER
+        text = f"{method_description} {paper_title}".lower()
+        return _categorize_text(text)
     
     @staticmethod
     def get_category_description(category: MethodCategory) -> str:
@@ -3,10 +3,26 @@ Forethought Integration (Stub)
 Simulates ingesting incident tickets or support reports related to driving failures.
 """
 from typing import List, Dict, Any
+from collections import Counter
 from datetime import datetime, timedelta
 import random
 
 
+# Mock incident vocabularies, shared across calls
+_INCIDENT_TYPES = (
+    "adverse_weather_failure",
+    "cut_in_collision",
+    "pedestrian_near_miss",
+    "sensor_occlusion",
+    "planning_timeout",
+    "false_positive_brake"
+)
+
+_SEVERITIES = ("critical", "high", "medium", "low")
+
+_RESOLUTION_STATUSES = ("open", "investigating", "resolved")
+
+
 class ForethoughtIncidentService:
     """
     Stub service for Forethought incident integration.
@@ -30,31 +46,29 @@ class ForethoughtIncidentService:
         if not self.enabled:
             return []
         
-        # Mock incident data
-        incident_types = [
-            "adverse_weather_failure",
-            "cut_in_collision",
-            "pedestrian_near_miss",
-            "sensor_occlusion",
-            "planning_timeout",
-            "false_positive_brake"
-        ]
-        
-        severities = ["critical", "high", "medium", "low"]
-        
-        incidents = []
-        for i in range(random.randint(5, 15)):
-            incident_date = datetime.now() - timedelta(days=random.randint(0, days))
-            
-            incidents.append({
+        # Draw every random field in one batched call per column
+        n = random.randint(5, 15)
+        types = random.choices(_INCIDENT_TYPES, k=n)
+        severities = random.choices(_SEVERITIES, k=n)
+        described_types = random.choices(_INCIDENT_TYPES, k=n)
+        day_offsets = random.choices(range(days + 1), k=n)
+        affected = random.choices(range(1, 101), k=n)
+        statuses = random.choices(_RESOLUTION_STATUSES, k=n)
+        
+        now = datetime.now()
+        incidents = [
+            {
                 "incident_id": f"INC-{1000 + i}",
-                "type": random.choice(incident_types),
-                "severity": random.choice(severities),
-                "description": f"Mock incident report for {random.choice(incident_types)}",
-                "reported_at": incident_date.isoformat(),
-                "affected_users": random.randint(1, 100),
-                "resolution_status": random.choice(["open", "investigating", "resolved"])
-            })
+                "type": incident_type,
+                "severity": severity,
+                "description": f"Mock incident report for {described_type}",
+                "reported_at": (now - timedelta(days=day_offset)).isoformat(),
+                "affected_users": affected_users,
+                "resolution_status": status
+            }
+            for i, (incident_type, severity, described_type, day_offset, affected_users, status)
+            in enumerate(zip(types, severities, described_types, day_offsets, affected, statuses))
+        ]
         
         return incidents
     
@@ -74,18 +88,15 @@ class ForethoughtIncidentService:
         incidents = self.get_recent_incidents()
         
         # Count incidents by type
-        type_counts = {}
-        for incident in incidents:
-            incident_type = incident["type"]
-            type_counts[incident_type] = type_counts.get(incident_type, 0) + 1
+        type_counts = Counter(incident["type"] for incident in incidents)
         
         # Find most common issues
-        sorted_types = sorted(type_counts.items(), key=lambda x: x[1], reverse=True)
+        sorted_types = type_counts.most_common()
         
         return {
             "enabled": True,
             "total_incidents": len(incidents),
-            "incident_breakdown": type_counts,
+            "incident_breakdown": dict(type_counts),
             "top_issues": [t[0] for t in sorted_types[:3]],
             "recommendations": {
                 "research_focus": [
@@ -14,6 +14,8 @@ import shutil
 import argparse
 from pathlib import Path
 import csv
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 try:
     from nuscenes.nuscenes import NuScenes
@@ -23,35 +25,151 @@ except ImportError:
     NUSCENES_AVAILABLE = False
     print("⚠️  nuscenes-devkit not installed. Install with: pip install nuscenes-devkit")
 
+try:
+    import orjson
+    
+    def dumps_json(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def dumps_json(obj):
+        return json.dumps(obj, indent=2).encode()
+
+
+TELEMETRY_FIELDNAMES = (
+    'frame_id', 'timestamp', 'ego_speed_mps', 'ego_yaw', 'road_type', 'weather',
+    'lead_distance_m', 'cut_in_flag', 'pedestrian_flag', 'brake_flag'
+)
+
+# Bytes per sendfile call when a frame cannot be hardlinked
+COPY_CHUNK_SIZE = 1 << 24
+
+# dir_fd-relative file operations are POSIX-only (not available on Windows)
+DIR_FD_SUPPORTED = (
+    hasattr(os, 'O_DIRECTORY')
+    and {os.open, os.link, os.unlink} <= os.supports_dir_fd
+)
+
+
+@contextmanager
+def open_dir(path):
+    """
+    Open a directory as a file descriptor for dir_fd-relative file operations.
+    
+    Yields the path itself where dir_fd is unsupported.
+    """
+    if not DIR_FD_SUPPORTED:
+        yield path
+        return
+    dir_fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        yield dir_fd
+    finally:
+        os.close(dir_fd)
+
+
+def fast_copy(src, dst_name, dst_dir_fd):
+    """
+    Copy a frame into an open directory without pulling its bytes through Python.
+    
+    Hardlinks when source and destination share a filesystem; otherwise
+    copies in-kernel with sendfile where the platform allows it. dst_name is resolved relative to
+    dst_dir_fd, so the kernel does not re-walk the frames path per frame.
+    Frames are only read downstream, so copy2's metadata is not needed.
+    Without dir_fd support, dst_dir_fd is the directory path from open_dir
+    and the frame is copied with shutil.copy2.
+    """
+    if not DIR_FD_SUPPORTED:
+        shutil.copy2(src, os.path.join(dst_dir_fd, dst_name))
+        return
+    
+    try:
+        os.unlink(dst_name, dir_fd=dst_dir_fd)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst_name, dst_dir_fd=dst_dir_fd)
+        return
+    except OSError:
+        pass
+    
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst_name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644, dir_fd=dst_dir_fd)
+        try:
+            offset = 0
+            while True:
+                sent = os.sendfile(dst_fd, src_fd, offset, COPY_CHUNK_SIZE)
+                if not sent:
+                    break
+                offset += sent
+        except OSError:
+            # sendfile into a regular file is Linux-only; copy through userspace
+            os.lseek(src_fd, 0, os.SEEK_SET)
+            os.lseek(dst_fd, 0, os.SEEK_SET)
+            os.ftruncate(dst_fd, 0)
+            with open(src_fd, 'rb', closefd=False) as fsrc, open(dst_fd, 'wb', closefd=False) as fdst:
+                shutil.copyfileobj(fsrc, fdst)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
 
 def detect_events(sample_data, annotations):
     """Detect events from nuScenes annotations."""
     events = []
     
-    # Check for pedestrians
-    pedestrians = [ann for ann in annotations if 'pedestrian' in ann['category_name'].lower()]
+    # Count pedestrians and close vehicles in a single pass. nuScenes
+    # category names are already lowercase (e.g. human.pedestrian.adult).
+    pedestrians = 0
+    close_vehicles = 0
+    for ann in annotations:
+        category = ann['category_name']
+        if 'pedestrian' in category:
+            pedestrians += 1
+        elif 'vehicle' in category and ann.get('distance', 100) < 20:
+            # Vehicles cutting in (close proximity + lateral movement)
+            close_vehicles += 1
+    
     if pedestrians:
         events.append({
             'type': 'pedestrian',
-            'severity': 'high' if len(pedestrians) > 2 else 'medium',
-            'count': len(pedestrians)
+            'severity': 'high' if pedestrians > 2 else 'medium',
+            'count': pedestrians
         })
     
-    # Check for vehicles cutting in (close proximity + lateral movement)
-    vehicles = [ann for ann in annotations if 'vehicle' in ann['category_name'].lower()]
-    close_vehicles = [v for v in vehicles if v.get('distance', 100) < 20]
     if close_vehicles:
         events.append({
             'type': 'cut_in',
             'severity': 'medium',
-            'count': len(close_vehicles)
+            'count': close_vehicles
         })
     
     return events
 
 
-def convert_scene(nusc, scene, output_dir):
+def build_token_tables(nusc):
+    """
+    Index the nuScenes tables used by convert_scene by token.
+    
+    A plain dict lookup avoids the per-call table dispatch in nusc.get(),
+    which otherwise runs once per annotation of every sample.
+    """
+    return {
+        table: {record['token']: record for record in getattr(nusc, table)}
+        for table in ('sample', 'sample_data', 'ego_pose', 'sample_annotation')
+    }
+
+
+def convert_scene(nusc, scene, output_dir, tables=None):
     """Convert a single nuScenes scene to AutoLab format."""
+    if tables is None:
+        tables = build_token_tables(nusc)
+    samples = tables['sample']
+    sample_data = tables['sample_data']
+    ego_poses = tables['ego_pose']
+    sample_annotations = tables['sample_annotation']
+    
     scene_name = scene['name']
     scene_token = scene['token']
     
@@ -62,85 +180,87 @@ def convert_scene(nusc, scene, output_dir):
     frames_path = os.path.join(dataset_path, "frames")
     os.makedirs(frames_path, exist_ok=True)
     
+    # Source path prefix for the per-frame loop
+    dataroot_prefix = os.path.join(nusc.dataroot, '')
+    
     # Get first sample
     sample_token = scene['first_sample_token']
     
-    telemetry_data = []
     events = []
     frame_count = 0
     
-    while sample_token:
-        sample = nusc.get('sample', sample_token)
-        
-        # Get camera data (front camera)
-        cam_front_data = nusc.get('sample_data', sample['data']['CAM_FRONT'])
-        
-        # Copy image to frames folder
-        src_image = os.path.join(nusc.dataroot, cam_front_data['filename'])
-        dst_image = os.path.join(frames_path, f"frame_{frame_count:06d}.jpg")
-        
-        if os.path.exists(src_image):
-            shutil.copy2(src_image, dst_image)
-        
-        # Get ego pose
-        ego_pose = nusc.get('ego_pose', cam_front_data['ego_pose_token'])
-        
-        # Get annotations
-        annotations = [nusc.get('sample_annotation', token) for token in sample['anns']]
-        
-        # Calculate speed (simplified - from translation change)
-        speed_mps = 10.0  # Default, would need to calculate from pose changes
-        
-        # Detect road type and weather (simplified)
-        road_type = "urban"  # nuScenes is mostly urban
-        weather = "clear"  # Would need to parse from scene description
-        
-        # Detect events
-        frame_events = detect_events(cam_front_data, annotations)
-        
-        # Determine flags
-        pedestrian_flag = 1 if any(e['type'] == 'pedestrian' for e in frame_events) else 0
-        cut_in_flag = 1 if any(e['type'] == 'cut_in' for e in frame_events) else 0
-        brake_flag = 0  # Would need CAN bus data
-        
-        # Add to telemetry
-        telemetry_data.append({
-            'frame_id': f"frame_{frame_count:06d}",
-            'timestamp': round(frame_count * 0.5, 1),  # nuScenes is ~2Hz
-            'ego_speed_mps': speed_mps,
-            'ego_yaw': 0.0,
-            'road_type': road_type,
-            'weather': weather,
-            'lead_distance_m': 30.0,  # Would need to calculate from annotations
-            'cut_in_flag': cut_in_flag,
-            'pedestrian_flag': pedestrian_flag,
-            'brake_flag': brake_flag
-        })
-        
-        # Record events
-        if frame_events and frame_count % 10 == 0:  # Sample events
-            for event in frame_events:
-                events.append({
-                    'frame_number': frame_count,
-                    'event_type': event['type'],
-                    'severity': event['severity'],
-                    'ego_speed_mps': speed_mps,
-                    'road_type': road_type,
-                    'weather': weather,
-                    'lead_distance_m': 30.0,
-                    'cut_in_flag': cut_in_flag
-                })
-        
-        frame_count += 1
-        sample_token = sample['next']
-    
-    # Write telemetry.csv
+    # Stream telemetry rows to disk as frames are converted
     telemetry_path = os.path.join(dataset_path, 'telemetry.csv')
-    with open(telemetry_path, 'w', newline='') as f:
-        if telemetry_data:
-            writer = csv.DictWriter(f, fieldnames=telemetry_data[0].keys())
-            writer.writeheader()
-            writer.writerows(telemetry_data)
+    with open(telemetry_path, 'w', newline='', buffering=1 << 20) as telemetry_file, \
+            open_dir(frames_path) as frames_fd:
+        writer = csv.writer(telemetry_file)
+        writer.writerow(TELEMETRY_FIELDNAMES)
+        
+        while sample_token:
+            sample = samples[sample_token]
+            
+            # Get camera data (front camera)
+            cam_front_data = sample_data[sample['data']['CAM_FRONT']]
+            
+            # Copy image to frames folder
+            src_image = dataroot_prefix + cam_front_data['filename']
+            dst_name = f"frame_{frame_count:06d}.jpg"
+            
+            if os.path.exists(src_image):
+                fast_copy(src_image, dst_name, frames_fd)
+            
+            # Get ego pose
+            ego_pose = ego_poses[cam_front_data['ego_pose_token']]
+            
+            # Get annotations
+            annotations = [sample_annotations[token] for token in sample['anns']]
+            
+            # Calculate speed (simplified - from translation change)
+            speed_mps = 10.0  # Default, would need to calculate from pose changes
+            
+            # Detect road type and weather (simplified)
+            road_type = "urban"  # nuScenes is mostly urban
+            weather = "clear"  # Would need to parse from scene description
+            
+            # Detect events
+            frame_events = detect_events(cam_front_data, annotations)
+            
+            # Determine flags
+            event_types = {e['type'] for e in frame_events}
+            pedestrian_flag = int('pedestrian' in event_types)
+            cut_in_flag = int('cut_in' in event_types)
+            brake_flag = 0  # Would need CAN bus data
+            
+            # Add to telemetry (values in TELEMETRY_FIELDNAMES order)
+            writer.writerow((
+                f"frame_{frame_count:06d}",
+                round(frame_count * 0.5, 1),  # nuScenes is ~2Hz
+                speed_mps,
+                0.0,  # ego_yaw
+                road_type,
+                weather,
+                30.0,  # lead_distance_m, would need to calculate from annotations
+                cut_in_flag,
+                pedestrian_flag,
+                brake_flag
+            ))
+            
+            # Record events
+            if frame_events and frame_count % 10 == 0:  # Sample events
+                for event in frame_events:
+                    events.append({
+                        'frame_number': frame_count,
+                        'event_type': event['type'],
+                        'severity': event['severity'],
+                        'ego_speed_mps': speed_mps,
+                        'road_type': road_type,
+                        'weather': weather,
+                        'lead_distance_m': 30.0,
+                        'cut_in_flag': cut_in_flag
+                    })
+            
+            frame_count += 1
+            sample_token = sample['next']
     
     # Write metadata.json
     metadata = {
@@ -154,8 +274,8 @@ def convert_scene(nusc, scene, output_dir):
         'events': events[:5]  # Limit to 5 events
     }
     
-    with open(os.path.join(dataset_path, 'metadata.json'), 'w') as f:
-        json.dump(metadata, f, indent=2)
+    with open(os.path.join(dataset_path, 'metadata.json'), 'wb') as f:
+        f.write(dumps_json(metadata))
     
     print(f"✅ Converted {frame_count} frames")
     print(f"   Events detected: {len(events)}")
@@ -169,12 +289,33 @@ def convert_scene(nusc, scene, output_dir):
     return dataset_path
 
 
+# nuScenes handle and token tables for scene workers. Populated by main()
+# before the pool starts so forked workers inherit them; spawned workers
+# load their own copy in _init_worker.
+_worker_state = {}
+
+
+def _init_worker(nuscenes_path, version):
+    if 'nusc' not in _worker_state:
+        nusc = NuScenes(version=version, dataroot=nuscenes_path, verbose=False)
+        _worker_state['nusc'] = nusc
+        _worker_state['tables'] = build_token_tables(nusc)
+
+
+def _convert_scene_worker(scene, output_dir):
+    return convert_scene(_worker_state['nusc'], scene, output_dir, _worker_state['tables'])
+
+
 def main():
     parser = argparse.ArgumentParser(description='Convert nuScenes to AutoLab format')
     parser.add_argument('--nuscenes-path', required=True, help='Path to nuScenes dataset')
     parser.add_argument('--output', default='backend/storage/datasets', help='Output directory')
     parser.add_argument('--version', default='v1.0-mini', help='nuScenes version (v1.0-mini, v1.0-trainval)')
     parser.add_argument('--max-scenes', type=int, default=5, help='Maximum number of scenes to convert')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Parallel scene worker processes (default: 1). Where workers are spawned '
+                             'rather than forked (macOS, Windows) each one loads its own copy of the '
+                             'nuScenes tables, several GB per worker for v1.0-trainval')
     
     args = parser.parse_args()
     
@@ -209,15 +350,36 @@ def main():
     # Create output directory
     os.makedirs(args.output, exist_ok=True)
     
-    # Convert scenes
+    _worker_state['nusc'] = nusc
+    _worker_state['tables'] = build_token_tables(nusc)
+    
+    # Convert scenes (independent, optionally one per worker process)
+    scenes = nusc.scene[:args.max_scenes]
+    max_workers = min(len(scenes), args.workers)
     converted = 0
-    for scene in nusc.scene[:args.max_scenes]:
-        try:
-            convert_scene(nusc, scene, args.output)
-            converted += 1
-        except Exception as e:
-            print(f"❌ Error converting scene {scene['name']}: {e}")
-            continue
+    if max_workers <= 1:
+        for scene in scenes:
+            try:
+                _convert_scene_worker(scene, args.output)
+                converted += 1
+            except Exception as e:
+                print(f"❌ Error converting scene {scene['name']}: {e}")
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(args.nuscenes_path, args.version)
+        ) as executor:
+            futures = {
+                executor.submit(_convert_scene_worker, scene, args.output): scene
+                for scene in scenes
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    converted += 1
+                except Exception as e:
+                    print(f"❌ Error converting scene {futures[future]['name']}: {e}")
     
     print(f"\n🎉 Conversion complete!")
     print(f"   Converted {converted}/{args.max_scenes} scenes")
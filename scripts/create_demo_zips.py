@@ -3,6 +3,16 @@ Create ZIP files from existing datasets for easy upload.
 """
 import os
 import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Datasets modified longer ago than this are skipped
+MAX_DATASET_AGE_SECONDS = 24 * 60 * 60
+
+# make_archive stopped calling os.chdir for zip archives in Python 3.10.6;
+# before that, concurrent calls race on the process working directory
+THREADED_ARCHIVES = sys.version_info >= (3, 10, 6)
 
 def create_zips():
     # Get absolute paths
@@ -16,29 +26,45 @@ def create_zips():
     print("📦 Creating ZIP files from existing datasets...\n")
     
     # Find all dataset directories (only recent ones with telemetry.csv)
+    cutoff = time.time() - MAX_DATASET_AGE_SECONDS
     datasets = []
-    for item in os.listdir(datasets_dir):
-        item_path = os.path.join(datasets_dir, item)
-        if os.path.isdir(item_path) and item != "demos":
-            # Check if it has frames AND telemetry.csv
-            frames_path = os.path.join(item_path, "frames")
-            telemetry_path = os.path.join(item_path, "telemetry.csv")
-            if os.path.exists(frames_path) and os.path.exists(telemetry_path):
-                # Only include datasets from today
-                if "145632" in item or "145633" in item or "145635" in item or "145636" in item:
-                    datasets.append((item, item_path))
+    with os.scandir(datasets_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir() or entry.name == "demos":
+                continue
+            # Only include datasets generated within the last day
+            if entry.stat().st_mtime < cutoff:
+                continue
+            # Check if it has frames AND telemetry.csv (one listing, no extra stats)
+            with os.scandir(entry.path) as children:
+                child_names = {child.name for child in children}
+            if "frames" in child_names and "telemetry.csv" in child_names:
+                datasets.append((entry.name, entry.path))
     
     if not datasets:
         print("❌ No datasets found!")
         return
     
     zip_files = []
-    for name, path in datasets:
-        print(f"Creating ZIP for: {name}")
-        zip_path = os.path.join(output_dir, name)
-        shutil.make_archive(zip_path, 'zip', path)
-        zip_files.append(f"{zip_path}.zip")
-        print(f"✅ Created: {name}.zip\n")
+    if THREADED_ARCHIVES:
+        # Archive datasets concurrently; the work is mostly file I/O, which
+        # releases the GIL
+        with ThreadPoolExecutor(max_workers=min(8, len(datasets))) as executor:
+            futures = {}
+            for name, path in datasets:
+                print(f"Creating ZIP for: {name}")
+                zip_path = os.path.join(output_dir, name)
+                futures[executor.submit(shutil.make_archive, zip_path, 'zip', path)] = name
+            
+            for future in as_completed(futures):
+                zip_files.append(future.result())
+                print(f"✅ Created: {futures[future]}.zip\n")
+    else:
+        for name, path in datasets:
+            print(f"Creating ZIP for: {name}")
+            zip_path = os.path.join(output_dir, name)
+            zip_files.append(shutil.make_archive(zip_path, 'zip', path))
+            print(f"✅ Created: {name}.zip\n")
     
     print(f"🎉 Created {len(zip_files)} ZIP files!")
     print(f"\n📁 Location: {os.path.abspath(output_dir)}")
@@ -4,62 +4,62 @@ Create a sample dataset for testing AutoLab Drive.
 Generates synthetic frames and telemetry data.
 """
 import os
-import csv
+import io
+import time
 import zipfile
-from pathlib import Path
+from functools import lru_cache
+from multiprocessing import Pool
 from PIL import Image, ImageDraw, ImageFont
-import random
+import numpy as np
+import pandas as pd
 
-def create_sample_dataset(output_path: str = "sample_dataset.zip", num_frames: int = 100):
+from jpeg_encoding import encode_jpeg
+
+def create_sample_dataset(output_path: str = "sample_dataset.zip", num_frames: int = 100,
+                          store: bool = False):
     """
     Create a sample dataset ZIP file.
     
     Args:
         output_path: Path to output ZIP file
         num_frames: Number of frames to generate
+        store: Write frames uncompressed (faster, but a much larger ZIP)
     """
     print(f"Creating sample dataset with {num_frames} frames...")
     
-    # Create temporary directory
-    temp_dir = Path("temp_dataset")
-    temp_dir.mkdir(exist_ok=True)
-    frames_dir = temp_dir / "frames"
-    frames_dir.mkdir(exist_ok=True)
-    
-    # Generate frames
-    print("Generating frames...")
-    for i in range(1, num_frames + 1):
-        frame_path = frames_dir / f"frame_{i:06d}.jpg"
-        create_sample_frame(frame_path, i, num_frames)
-        if i % 20 == 0:
-            print(f"  Generated {i}/{num_frames} frames")
-    
-    # Generate telemetry
-    print("Generating telemetry...")
-    telemetry_path = temp_dir / "telemetry.csv"
-    create_sample_telemetry(telemetry_path, num_frames)
-    
-    # Create ZIP
-    print("Creating ZIP file...")
-    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for file_path in temp_dir.rglob('*'):
-            if file_path.is_file():
-                arcname = file_path.relative_to(temp_dir)
-                zipf.write(file_path, arcname)
-    
-    # Cleanup
-    print("Cleaning up...")
-    import shutil
-    shutil.rmtree(temp_dir)
+    frame_args = [(i, num_frames) for i in range(1, num_frames + 1)]
+    
+    # Write frames and telemetry straight into the ZIP (no temp directory)
+    frame_compression = zipfile.ZIP_STORED if store else zipfile.ZIP_DEFLATED
+    with zipfile.ZipFile(output_path, 'w', frame_compression) as zipf:
+        # Generate frames (independent, CPU-bound drawing + JPEG encode)
+        print("Generating frames...")
+        with Pool() as pool:
+            frames = pool.imap(_render_frame, frame_args, chunksize=32)
+            for i, jpeg_bytes in enumerate(frames, 1):
+                zipf.writestr(f"frames/frame_{i:06d}.jpg", jpeg_bytes)
+                if i % 20 == 0:
+                    print(f"  Generated {i}/{num_frames} frames")
+        
+        # Generate telemetry
+        print("Generating telemetry...")
+        telemetry_info = zipfile.ZipInfo('telemetry.csv', date_time=time.localtime()[:6])
+        telemetry_info.compress_type = zipfile.ZIP_DEFLATED
+        with zipf.open(telemetry_info, 'w') as raw, io.TextIOWrapper(raw, newline='') as csvfile:
+            create_sample_telemetry(csvfile, num_frames)
     
     print(f"✓ Sample dataset created: {output_path}")
     print(f"  - {num_frames} frames")
     print(f"  - Telemetry CSV with synthetic events")
     print(f"  - File size: {os.path.getsize(output_path) / 1024 / 1024:.2f} MB")
 
-def create_sample_frame(path: Path, frame_num: int, total_frames: int):
-    """Create a sample frame image with text overlay."""
-    # Create image
+def _render_frame(args):
+    """Pool worker wrapper around create_sample_frame."""
+    return create_sample_frame(*args)
+
+@lru_cache(maxsize=None)
+def _frame_background() -> Image.Image:
+    """Static road/horizon background shared by every sample frame."""
     img = Image.new('RGB', (640, 480), color=(50, 50, 50))
     draw = ImageDraw.Draw(img)
     
@@ -69,14 +69,24 @@ def create_sample_frame(path: Path, frame_num: int, total_frames: int):
     
     # Draw horizon
     draw.line([0, 200, 640, 200], fill=(100, 150, 200), width=2)
-    
-    # Add frame number
+    return img
+
+@lru_cache(maxsize=None)
+def _frame_font():
+    """Overlay font, resolved once per process."""
     try:
         # Try to use default font, fallback to basic if not available
-        font = ImageFont.load_default()
+        return ImageFont.load_default()
     except:
-        font = None
+        return None
+
+def create_sample_frame(frame_num: int, total_frames: int) -> bytes:
+    """Create a sample frame image with text overlay and return its JPEG bytes."""
+    img = _frame_background().copy()
+    draw = ImageDraw.Draw(img)
+    font = _frame_font()
     
+    # Add frame number
     text = f"Frame {frame_num}/{total_frames}"
     draw.text((10, 10), text, fill=(255, 255, 255), font=font)
     
@@ -85,82 +95,72 @@ def create_sample_frame(path: Path, frame_num: int, total_frames: int):
     time_text = f"t={timestamp:.1f}s"
     draw.text((10, 30), time_text, fill=(255, 255, 255), font=font)
     
-    # Save
-    img.save(path, 'JPEG', quality=85)
+    # Encode
+    return encode_jpeg(img, 85)
 
-def create_sample_telemetry(path: Path, num_frames: int):
-    """Create sample telemetry CSV with synthetic events."""
-    with open(path, 'w', newline='') as csvfile:
-        fieldnames = [
-            'frame_id', 'timestamp', 'ego_speed_mps', 'ego_yaw',
-            'road_type', 'weather', 'lead_distance_m',
-            'cut_in_flag', 'pedestrian_flag'
-        ]
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        # Generate telemetry data
-        base_speed = 20.0  # m/s (~72 km/h)
-        yaw = 0.0
-        lead_distance = 50.0
-        
-        # Define event windows
-        cut_in_start = 30
-        cut_in_end = 35
-        pedestrian_start = 60
-        pedestrian_end = 65
-        weather_change_start = 80
-        
-        for i in range(1, num_frames + 1):
-            timestamp = (i - 1) * 0.1
-            
-            # Simulate speed variations
-            speed = base_speed + random.uniform(-2, 2)
-            
-            # Simulate cut-in event (sudden lead distance decrease)
-            if cut_in_start <= i <= cut_in_end:
-                lead_distance = max(10.0, lead_distance - 5.0)
-                cut_in_flag = 1
-            else:
-                lead_distance = min(50.0, lead_distance + 2.0)
-                cut_in_flag = 0
-            
-            # Simulate pedestrian event
-            pedestrian_flag = 1 if pedestrian_start <= i <= pedestrian_end else 0
-            
-            # Simulate weather change
-            if i < weather_change_start:
-                weather = 'clear'
-            else:
-                weather = 'rain'
-            
-            # Simulate lane change (yaw variation)
-            if 45 <= i <= 50:
-                yaw += 2.0
-            elif 50 < i <= 55:
-                yaw -= 2.0
-            else:
-                yaw += random.uniform(-0.5, 0.5)
-            
-            # Road type
-            if i < 40:
-                road_type = 'highway'
-            elif i < 70:
-                road_type = 'urban'
-            else:
-                road_type = 'highway'
-            
-            writer.writerow({
-                'frame_id': f'frame_{i:06d}',
-                'timestamp': round(timestamp, 1),
-                'ego_speed_mps': round(speed, 1),
-                'ego_yaw': round(yaw, 1),
-                'road_type': road_type,
-                'weather': weather,
-                'lead_distance_m': round(lead_distance, 1),
-                'cut_in_flag': cut_in_flag,
-                'pedestrian_flag': pedestrian_flag
-            })
+def create_sample_telemetry(csvfile, num_frames: int):
+    """Write sample telemetry CSV with synthetic events to an open text file."""
+    fieldnames = [
+        'frame_id', 'timestamp', 'ego_speed_mps', 'ego_yaw',
+        'road_type', 'weather', 'lead_distance_m',
+        'cut_in_flag', 'pedestrian_flag'
+    ]
+    
+    # Generate telemetry data (whole columns at once)
+    base_speed = 20.0  # m/s (~72 km/h)
+    rng = np.random.default_rng()
+    
+    # Define event windows
+    cut_in_start = 30
+    cut_in_end = 35
+    pedestrian_start = 60
+    pedestrian_end = 65
+    weather_change_start = 80
+    
+    i = np.arange(1, num_frames + 1)
+    timestamp = (i - 1) * 0.1
+    
+    # Simulate speed variations
+    speed = base_speed + rng.uniform(-2, 2, num_frames)
+    
+    # Simulate cut-in event (lead distance drops 5 m per frame inside the
+    # window, floored at 10 m, then recovers 2 m per frame, capped at 50 m)
+    cut_in = (i >= cut_in_start) & (i <= cut_in_end)
+    frames_into_cut_in = np.clip(i - cut_in_start + 1, 0, cut_in_end - cut_in_start + 1)
+    frames_after_cut_in = np.maximum(i - cut_in_end, 0)
+    lead_distance = np.maximum(10.0, 50.0 - 5.0 * frames_into_cut_in)
+    lead_distance = np.minimum(50.0, lead_distance + 2.0 * frames_after_cut_in)
+    cut_in_flag = cut_in.astype(np.int8)
+    
+    # Simulate pedestrian event
+    pedestrian_flag = ((i >= pedestrian_start) & (i <= pedestrian_end)).astype(np.int8)
+    
+    # Simulate weather change
+    weather = np.where(i < weather_change_start, 'clear', 'rain')
+    
+    # Simulate lane change (yaw variation)
+    yaw_delta = np.where(
+        (i >= 45) & (i <= 50), 2.0,
+        np.where((i > 50) & (i <= 55), -2.0, rng.uniform(-0.5, 0.5, num_frames))
+    )
+    yaw = np.cumsum(yaw_delta)
+    
+    # Road type
+    road_type = np.where((i >= 40) & (i < 70), 'urban', 'highway')
+    
+    # Format and write all rows in one vectorized call
+    telemetry = pd.DataFrame({
+        'frame_id': [f'frame_{n:06d}' for n in range(1, num_frames + 1)],
+        'timestamp': np.round(timestamp, 1),
+        'ego_speed_mps': np.round(speed, 1),
+        'ego_yaw': np.round(yaw, 1),
+        'road_type': road_type,
+        'weather': weather,
+        'lead_distance_m': np.round(lead_distance, 1),
+        'cut_in_flag': cut_in_flag,
+        'pedestrian_flag': pedestrian_flag
+    }, columns=fieldnames)
+    telemetry.to_csv(csvfile, index=False, float_format='%.1f', lineterminator='\r\n')
 
 if __name__ == "__main__":
     import argparse
@@ -170,7 +170,9 @@ if __name__ == "__main__":
                         help='Output ZIP file path (default: sample_dataset.zip)')
     parser.add_argument('--frames', '-n', type=int, default=100,
                         help='Number of frames to generate (default: 100)')
+    parser.add_argument('--store', action='store_true',
+                        help='Store frame JPEGs uncompressed (faster, much larger ZIP)')
     
     args = parser.parse_args()
     
-    create_sample_dataset(args.output, args.frames)
+    create_sample_dataset(args.output, args.frames, args.store)
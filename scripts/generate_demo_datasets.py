@@ -3,14 +3,20 @@
 Generate multiple demo datasets for AutoLab Drive.
 Creates realistic autonomous driving scenarios with different conditions.
 """
+import io
 import os
 import sys
-import csv
+import time
 import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont
-import random
-import math
+import numpy as np
+import pandas as pd
+
+from jpeg_encoding import encode_jpeg
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent / "backend"))
@@ -48,34 +54,197 @@ DEMO_SCENARIOS = [
     }
 ]
 
-def create_frame(path: Path, frame_num: int, total_frames: int, scenario: str):
-    """Create a frame based on scenario."""
-    img = Image.new('RGB', (800, 600), color=(50, 50, 50))
-    draw = ImageDraw.Draw(img)
-    font = ImageFont.load_default()
+FRAME_WIDTH, FRAME_HEIGHT = 800, 600
+
+# Overlay font, loaded once per process rather than per frame
+_DEFAULT_FONT = ImageFont.load_default()
+
+
+def fill_rect(arr, box, color):
+    """Fill an inclusive [x0, y0, x1, y1] box, clipped to the frame (as ImageDraw.rectangle)."""
+    x0, y0, x1, y1 = box
+    arr[max(y0, 0):max(y1 + 1, 0), max(x0, 0):max(x1 + 1, 0)] = color
+
+def outline_rect(arr, box, color, width):
+    """Draw an inward outline of the given width around an inclusive box."""
+    x0, y0, x1, y1 = box
+    fill_rect(arr, (x0, y0, x1, y0 + width - 1), color)
+    fill_rect(arr, (x0, y1 - width + 1, x1, y1), color)
+    fill_rect(arr, (x0, y0, x0 + width - 1, y1), color)
+    fill_rect(arr, (x1 - width + 1, y0, x1, y1), color)
+
+def _line_offsets(dx, dy):
+    """Pixel offsets ImageDraw.line covers for a 1px line from (0, 0) to (dx, dy)."""
+    mask = Image.new('1', (dx + 1, dy + 1))
+    ImageDraw.Draw(mask).line([0, 0, dx, dy], fill=1)
+    return np.nonzero(np.asarray(mask))
+
+# Rain streak shape: a 1px line from (x, y) to (x + 2, y + 10)
+RAIN_STREAK = _line_offsets(2, 10)
+
+def stamp_rain(arr, xs, ys, color):
+    """Stamp a rain streak at every (x, y) start point with one indexed write."""
+    offset_y, offset_x = RAIN_STREAK
+    py = ys[:, None] + offset_y
+    px = xs[:, None] + offset_x
+    inside = (py < arr.shape[0]) & (px < arr.shape[1])
+    arr[py[inside], px[inside]] = color
+
+# Rainy frames cycle through this many precomputed streak patterns
+RAIN_TEMPLATE_COUNT = 8
+
+@lru_cache(maxsize=None)
+def rain_pixels(template: int, drops: int) -> tuple:
+    """
+    Pixel coordinates of `drops` rain streaks, built once per process.
+    
+    Returned as (rows, cols) index arrays so a frame is painted by
+    touching only the streak pixels, not by scanning a full-frame mask.
+    """
+    rng = np.random.default_rng(template)
+    mask = np.zeros((FRAME_HEIGHT, FRAME_WIDTH), dtype=bool)
+    xs = rng.integers(0, FRAME_WIDTH + 1, drops)
+    ys = rng.integers(0, FRAME_HEIGHT + 1, drops)
+    stamp_rain(mask, xs, ys, True)
+    rows, cols = np.nonzero(mask)
+    rows.flags.writeable = False
+    cols.flags.writeable = False
+    return rows, cols
+
+def scenario_seed(scenario: str) -> int:
+    """Stable RNG seed for a scenario (hash() of a str varies between processes)."""
+    return zlib.crc32(scenario.encode())
+
+@lru_cache(maxsize=16)
+def urban_buildings(seed: int):
+    """Skyline for the urban scene: five (x0, y0, x1, y1) building boxes."""
+    rng = np.random.default_rng(seed)
+    heights = rng.integers(100, 181, 5).tolist()
+    return tuple((i * 160, 200 - height, i * 160 + 140, 200) for i, height in enumerate(heights))
+
+CLEAR_SKY = (100, 150, 200)
+
+def weather_sky(progress: float):
+    """Sky color for the weather_adaptation scenario at a given progress."""
+    if progress < 0.33:
+        return CLEAR_SKY  # Clear
+    elif progress < 0.66:
+        return (80, 80, 100)  # Rain
+    else:
+        return (150, 150, 150)  # Fog
+
+@lru_cache(maxsize=None)
+def build_background(scenario: str, sky_color=CLEAR_SKY, fog: bool = False) -> np.ndarray:
+    """
+    Static sky, road and skyline layers for a scenario, built once per process.
+    
+    Frames start from a copy of this and only draw what moves.
+    """
+    arr = np.full((FRAME_HEIGHT, FRAME_WIDTH, 3), 50, dtype=np.uint8)
+    
+    if scenario == "urban_navigation":
+        # Sky
+        fill_rect(arr, (0, 0, 800, 200), (120, 160, 220))
+        # Buildings
+        for box in urban_buildings(scenario_seed(scenario)):
+            fill_rect(arr, box, (80, 80, 100))
+        # Road
+        fill_rect(arr, (0, 350, 800, 600), (70, 70, 70))
+    else:
+        # Sky
+        fill_rect(arr, (0, 0, 800, 250), sky_color)
+        # Road
+        fill_rect(arr, (200, 250, 600, 600), (60, 60, 60))
+    
+    if scenario == "highway_cruise":
+        # Side barriers (3px wide)
+        fill_rect(arr, (199, 250, 201, 600), (200, 200, 200))
+        fill_rect(arr, (599, 250, 601, 600), (200, 200, 200))
     
+    if fog:
+        # Composite a (200, 200, 200) layer at alpha 100/255 in one pass
+        arr = ((arr.astype(np.uint16) * 155 + 100 * 200) // 255).astype(np.uint8)
+    
+    arr.flags.writeable = False
+    return arr
+
+@lru_cache(maxsize=None)
+def frame_arena() -> np.ndarray:
+    """
+    Scratch pixel buffer reused by every frame this process renders.
+    
+    Image.fromarray copies out of it, so reuse is safe and saves a
+    full-frame allocation per frame.
+    """
+    return np.empty((FRAME_HEIGHT, FRAME_WIDTH, 3), dtype=np.uint8)
+
+MERGE_VEHICLES = [
+    (350, 320, (200, 50, 50)),
+    (420, 380, (50, 200, 50)),
+    (280, 450, (50, 50, 200))
+]
+
+@lru_cache(maxsize=None)
+def frame_motion(total_frames: int) -> dict:
+    """
+    Per-frame positions of every moving element, indexed by frame number.
+    
+    Computed as whole arrays once per process instead of as scalar math
+    inside each renderer.
+    """
+    f = np.arange(total_frames + 1)
+    progress = f / total_frames
+    merge_xs = np.array([x for x, _, _ in MERGE_VEHICLES])
+    return {
+        'lane_offset': f * 10 % 70,
+        'lead_y': 300 + (np.sin(f * 0.1) * 20).astype(int),
+        'obstacle_y': 280 + ((progress - 0.4) * 300).astype(int),
+        'merge_y_offsets': (np.sin(f[:, None] * 0.05 + merge_xs) * 10).astype(int),
+        'glow_size': 5 + (np.sin(f * 0.3) * 3).astype(int)
+    }
+
+def _render_one(args):
+    """Process-pool worker wrapper around create_frame."""
+    return create_frame(*args)
+
+def create_frame(frame_num: int, total_frames: int, scenario: str) -> bytes:
+    """Create a frame based on scenario and return its JPEG bytes."""
+    # Moving rectangles and rain are filled straight into a copy of the
+    # static background (in the per-process arena); only shapes that need
+    # PIL's rasterizer are drawn after wrapping it.
     progress = frame_num / total_frames
+    motion = frame_motion(total_frames)
+    # Seeded from (scenario, frame) so output does not depend on worker scheduling
+    rng = np.random.default_rng((scenario_seed(scenario), frame_num))
     
-    if scenario == "highway_cruise":
-        draw_highway_scene(draw, frame_num, progress)
-    elif scenario == "urban_navigation":
-        draw_urban_scene(draw, frame_num, progress)
-    elif scenario == "emergency_braking":
-        draw_emergency_scene(draw, frame_num, progress)
-    elif scenario == "weather_adaptation":
-        draw_weather_scene(draw, frame_num, progress)
-    elif scenario == "complex_merge":
-        draw_merge_scene(draw, frame_num, progress)
+    if scenario == "weather_adaptation":
+        background = build_background(scenario, weather_sky(progress), fog=progress > 0.66)
+    else:
+        background = build_background(scenario)
+    arr = frame_arena()
+    np.copyto(arr, background)
+    
+    draw_scene = _SCENE_FILLS.get(scenario)
+    if draw_scene is not None:
+        draw_scene(arr, frame_num, progress, motion)
+    
+    img = Image.fromarray(arr)
+    draw = ImageDraw.Draw(img)
+    font = _DEFAULT_FONT
+    
+    draw_overlay = _SCENE_OVERLAYS.get(scenario)
+    if draw_overlay is not None:
+        draw_overlay(draw, frame_num, progress, motion)
     
     # Add ego vehicle (self-driving car) at bottom
-    draw_ego_vehicle(draw, frame_num)
+    draw_ego_vehicle(draw, frame_num, motion)
     
     # Add HUD overlay
-    draw_hud(draw, font, frame_num, total_frames)
+    draw_hud(draw, font, frame_num, total_frames, rng)
     
-    img.save(path, 'JPEG', quality=90)
+    return encode_jpeg(img, 85)
 
-def draw_ego_vehicle(draw, frame_num):
+def draw_ego_vehicle(draw, frame_num, motion):
     """Draw the ego vehicle (self-driving car) at the bottom center."""
     # Car body - main rectangle
     car_x = 320
@@ -117,135 +286,84 @@ def draw_ego_vehicle(draw, frame_num):
     draw.ellipse([sensor_x - 15, sensor_y - 10, sensor_x + 15, sensor_y + 10], 
                  fill=(0, 255, 150), outline=(0, 200, 100), width=2)
     # Pulsing glow effect
-    glow_size = 5 + int(math.sin(frame_num * 0.3) * 3)
+    glow_size = int(motion['glow_size'][frame_num])
     draw.ellipse([sensor_x - glow_size, sensor_y - glow_size, 
                   sensor_x + glow_size, sensor_y + glow_size], 
                  fill=(100, 255, 200), outline=(50, 255, 150), width=1)
     
     # "AUTONOMOUS" label
-    try:
-        font = ImageFont.load_default()
-        draw.text((car_x + 45, car_y + 35), "AUTO", fill=(255, 255, 255), font=font)
-    except:
-        pass
+    draw.text((car_x + 45, car_y + 35), "AUTO", fill=(255, 255, 255), font=_DEFAULT_FONT)
 
-def draw_highway_scene(draw, frame_num, progress):
-    """Draw highway scene."""
-    # Sky
-    draw.rectangle([0, 0, 800, 250], fill=(100, 150, 200))
-    
-    # Road
-    draw.rectangle([200, 250, 600, 600], fill=(60, 60, 60))
-    
+def draw_highway_scene(arr, frame_num, progress, motion):
+    """Draw highway scene over its background."""
     # Lane markings
+    lane_offset = int(motion['lane_offset'][frame_num])
     for i in range(5):
-        y = 250 + (i * 70) - (frame_num * 10 % 70)
-        draw.rectangle([395, y, 405, y + 40], fill=(255, 255, 0))
-    
-    # Side barriers
-    draw.line([200, 250, 200, 600], fill=(200, 200, 200), width=3)
-    draw.line([600, 250, 600, 600], fill=(200, 200, 200), width=3)
+        y = 250 + (i * 70) - lane_offset
+        fill_rect(arr, (395, y, 405, y + 40), (255, 255, 0))
     
     # Lead vehicle (if present)
     if progress < 0.7:
-        lead_y = 300 + int(math.sin(frame_num * 0.1) * 20)
-        draw.rectangle([350, lead_y, 450, lead_y + 60], fill=(200, 50, 50))
+        lead_y = int(motion['lead_y'][frame_num])
+        fill_rect(arr, (350, lead_y, 450, lead_y + 60), (200, 50, 50))
 
-def draw_urban_scene(draw, frame_num, progress):
-    """Draw urban scene with buildings and pedestrians."""
-    # Sky
-    draw.rectangle([0, 0, 800, 200], fill=(120, 160, 220))
-    
-    # Buildings
-    for i in range(5):
-        x = i * 160
-        height = random.randint(100, 180)
-        draw.rectangle([x, 200 - height, x + 140, 200], fill=(80, 80, 100))
-    
-    # Road
-    draw.rectangle([0, 350, 800, 600], fill=(70, 70, 70))
-    
+def draw_urban_scene(arr, frame_num, progress, motion):
+    """Draw the urban crosswalk over the background."""
     # Crosswalk
     if 0.3 < progress < 0.5:
         for i in range(10):
             x = i * 80
-            draw.rectangle([x, 400, x + 40, 450], fill=(255, 255, 255))
-    
-    # Pedestrian
+            fill_rect(arr, (x, 400, x + 40, 450), (255, 255, 255))
+
+def draw_urban_overlay(draw, frame_num, progress, motion):
+    """Draw the crossing pedestrian over the urban scene."""
     if 0.35 < progress < 0.45:
         ped_x = 300 + int((progress - 0.35) * 2000)
         draw.ellipse([ped_x, 380, ped_x + 30, 410], fill=(255, 200, 150))
         draw.rectangle([ped_x + 5, 410, ped_x + 25, 450], fill=(50, 50, 200))
 
-def draw_emergency_scene(draw, frame_num, progress):
-    """Draw emergency braking scenario."""
-    # Sky
-    draw.rectangle([0, 0, 800, 250], fill=(100, 150, 200))
-    
-    # Road
-    draw.rectangle([200, 250, 600, 600], fill=(60, 60, 60))
-    
+def draw_emergency_scene(arr, frame_num, progress, motion):
+    """Draw emergency braking scenario over its background."""
     # Obstacle appears suddenly
     if progress > 0.4:
-        obstacle_y = 280 + int((progress - 0.4) * 300)
+        obstacle_y = int(motion['obstacle_y'][frame_num])
         # Red warning box
-        draw.rectangle([340, obstacle_y - 10, 460, obstacle_y + 70], 
-                      outline=(255, 0, 0), width=5)
+        outline_rect(arr, (340, obstacle_y - 10, 460, obstacle_y + 70), (255, 0, 0), 5)
         # Obstacle
-        draw.rectangle([350, obstacle_y, 450, obstacle_y + 50], fill=(150, 150, 0))
+        fill_rect(arr, (350, obstacle_y, 450, obstacle_y + 50), (150, 150, 0))
 
-def draw_weather_scene(draw, frame_num, progress):
-    """Draw scene with changing weather."""
-    # Sky color changes
-    if progress < 0.33:
-        sky_color = (100, 150, 200)  # Clear
-    elif progress < 0.66:
-        sky_color = (80, 80, 100)  # Rain
-    else:
-        sky_color = (150, 150, 150)  # Fog
-    
-    draw.rectangle([0, 0, 800, 250], fill=sky_color)
-    
-    # Road
-    draw.rectangle([200, 250, 600, 600], fill=(60, 60, 60))
-    
+def draw_weather_scene(arr, frame_num, progress, motion):
+    """Draw changing weather over the background (sky color and fog are baked into it)."""
     # Rain effect
     if 0.33 < progress < 0.66:
-        for _ in range(50):
-            x = random.randint(0, 800)
-            y = random.randint(0, 600)
-            draw.line([x, y, x + 2, y + 10], fill=(200, 200, 255), width=1)
-    
-    # Fog effect
-    if progress > 0.66:
-        overlay = Image.new('RGBA', (800, 600), (200, 200, 200, 100))
-        # Note: This is simplified; in real implementation would blend
+        arr[rain_pixels(frame_num % RAIN_TEMPLATE_COUNT, 50)] = (200, 200, 255)
 
-def draw_merge_scene(draw, frame_num, progress):
-    """Draw highway merge scenario."""
-    # Sky
-    draw.rectangle([0, 0, 800, 250], fill=(100, 150, 200))
-    
-    # Main road
-    draw.rectangle([200, 250, 600, 600], fill=(60, 60, 60))
-    
+def draw_merge_overlay(draw, frame_num, progress, motion):
+    """Draw the merge lane and surrounding vehicles."""
     # Merge lane
     merge_width = int(150 * (1 - progress))
     if merge_width > 0:
         draw.polygon([600, 250, 750, 250, 600, 400], fill=(70, 70, 70))
     
     # Multiple vehicles
-    vehicles = [
-        (350, 320, (200, 50, 50)),
-        (420, 380, (50, 200, 50)),
-        (280, 450, (50, 50, 200))
-    ]
-    
-    for x, y, color in vehicles:
-        y_offset = int(math.sin(frame_num * 0.05 + x) * 10)
+    y_offsets = motion['merge_y_offsets'][frame_num].tolist()
+    for (x, y, color), y_offset in zip(MERGE_VEHICLES, y_offsets):
         draw.rectangle([x, y + y_offset, x + 60, y + y_offset + 40], fill=color)
 
-def draw_hud(draw, font, frame_num, total_frames):
+# Scenario renderers: buffer fills run before the frame is wrapped for PIL,
+# overlays after it
+_SCENE_FILLS = {
+    "highway_cruise": draw_highway_scene,
+    "urban_navigation": draw_urban_scene,
+    "emergency_braking": draw_emergency_scene,
+    "weather_adaptation": draw_weather_scene
+}
+_SCENE_OVERLAYS = {
+    "urban_navigation": draw_urban_overlay,
+    "complex_merge": draw_merge_overlay
+}
+
+def draw_hud(draw, font, frame_num, total_frames, rng):
     """Draw heads-up display overlay."""
     timestamp = frame_num * 0.1
     
@@ -254,85 +372,72 @@ def draw_hud(draw, font, frame_num, total_frames):
     draw.text((10, 30), f"Time: {timestamp:.1f}s", fill=(0, 255, 0), font=font)
     
     # Speed indicator
-    speed = 20 + random.uniform(-2, 2)
+    speed = 20 + rng.uniform(-2, 2)
     draw.text((10, 560), f"Speed: {speed:.1f} m/s", fill=(0, 255, 0), font=font)
 
-def create_telemetry(path: Path, num_frames: int, scenario: str):
-    """Create telemetry CSV based on scenario."""
-    with open(path, 'w', newline='') as csvfile:
-        fieldnames = [
-            'frame_id', 'timestamp', 'ego_speed_mps', 'ego_yaw',
-            'road_type', 'weather', 'lead_distance_m',
-            'cut_in_flag', 'pedestrian_flag', 'brake_flag'
-        ]
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for i in range(1, num_frames + 1):
-            progress = i / num_frames
-            timestamp = (i - 1) * 0.1
-            
-            row = generate_telemetry_row(i, timestamp, progress, scenario)
-            writer.writerow(row)
-
-def generate_telemetry_row(frame_num, timestamp, progress, scenario):
-    """Generate telemetry row based on scenario."""
-    base_row = {
-        'frame_id': f'frame_{frame_num:06d}',
-        'timestamp': round(timestamp, 1),
-        'ego_speed_mps': 20.0,
-        'ego_yaw': 0.0,
+def create_telemetry(csvfile, num_frames: int, scenario: str):
+    """Write telemetry CSV based on scenario (whole columns at once) to an open text file."""
+    fieldnames = [
+        'frame_id', 'timestamp', 'ego_speed_mps', 'ego_yaw',
+        'road_type', 'weather', 'lead_distance_m',
+        'cut_in_flag', 'pedestrian_flag', 'brake_flag'
+    ]
+    rng = np.random.default_rng(scenario_seed(scenario))
+    
+    i = np.arange(1, num_frames + 1)
+    progress = i / num_frames
+    no_flag = np.zeros(num_frames, dtype=np.int8)
+    
+    # Defaults, overridden per scenario below
+    columns = {
+        'frame_id': [f'frame_{n:06d}' for n in range(1, num_frames + 1)],
+        'timestamp': np.round((i - 1) * 0.1, 1),
+        'ego_speed_mps': np.full(num_frames, 20.0),
+        'ego_yaw': np.zeros(num_frames),
         'road_type': 'highway',
         'weather': 'clear',
-        'lead_distance_m': 50.0,
-        'cut_in_flag': 0,
-        'pedestrian_flag': 0,
-        'brake_flag': 0
+        'lead_distance_m': np.full(num_frames, 50.0),
+        'cut_in_flag': no_flag,
+        'pedestrian_flag': no_flag,
+        'brake_flag': no_flag
     }
     
     if scenario == "highway_cruise":
-        base_row['ego_speed_mps'] = 25.0 + random.uniform(-1, 1)
-        if 0.3 < progress < 0.5:
-            base_row['ego_yaw'] = 5.0  # Lane change
-        base_row['lead_distance_m'] = 40.0 + random.uniform(-5, 5)
+        columns['ego_speed_mps'] = 25.0 + rng.uniform(-1, 1, num_frames)
+        lane_change = (progress > 0.3) & (progress < 0.5)
+        columns['ego_yaw'] = np.where(lane_change, 5.0, 0.0)  # Lane change
+        columns['lead_distance_m'] = 40.0 + rng.uniform(-5, 5, num_frames)
         
     elif scenario == "urban_navigation":
-        base_row['road_type'] = 'urban'
-        base_row['ego_speed_mps'] = 10.0 + random.uniform(-2, 2)
-        if 0.35 < progress < 0.45:
-            base_row['pedestrian_flag'] = 1
-            base_row['brake_flag'] = 1
-            base_row['ego_speed_mps'] = max(0, 10.0 - (progress - 0.35) * 100)
+        columns['road_type'] = 'urban'
+        crossing = (progress > 0.35) & (progress < 0.45)
+        columns['pedestrian_flag'] = crossing.astype(np.int8)
+        columns['brake_flag'] = crossing.astype(np.int8)
+        columns['ego_speed_mps'] = np.where(
+            crossing,
+            np.maximum(0, 10.0 - (progress - 0.35) * 100),
+            10.0 + rng.uniform(-2, 2, num_frames)
+        )
         
     elif scenario == "emergency_braking":
-        base_row['ego_speed_mps'] = 25.0
-        if progress > 0.4:
-            base_row['brake_flag'] = 1
-            base_row['lead_distance_m'] = max(5.0, 50.0 - (progress - 0.4) * 150)
-            base_row['ego_speed_mps'] = max(0, 25.0 - (progress - 0.4) * 60)
-        else:
-            base_row['lead_distance_m'] = 50.0
+        braking = progress > 0.4
+        columns['brake_flag'] = braking.astype(np.int8)
+        columns['lead_distance_m'] = np.where(braking, np.maximum(5.0, 50.0 - (progress - 0.4) * 150), 50.0)
+        columns['ego_speed_mps'] = np.where(braking, np.maximum(0, 25.0 - (progress - 0.4) * 60), 25.0)
             
     elif scenario == "weather_adaptation":
-        if progress < 0.33:
-            base_row['weather'] = 'clear'
-            base_row['ego_speed_mps'] = 25.0
-        elif progress < 0.66:
-            base_row['weather'] = 'rain'
-            base_row['ego_speed_mps'] = 18.0
-        else:
-            base_row['weather'] = 'fog'
-            base_row['ego_speed_mps'] = 12.0
+        phases = [progress < 0.33, progress < 0.66]
+        columns['weather'] = np.select(phases, ['clear', 'rain'], 'fog')
+        columns['ego_speed_mps'] = np.select(phases, [25.0, 18.0], 12.0)
             
     elif scenario == "complex_merge":
-        base_row['ego_speed_mps'] = 22.0 + random.uniform(-2, 2)
-        if 0.3 < progress < 0.5:
-            base_row['cut_in_flag'] = 1
-            base_row['lead_distance_m'] = 15.0
-        else:
-            base_row['lead_distance_m'] = 35.0
+        columns['ego_speed_mps'] = 22.0 + rng.uniform(-2, 2, num_frames)
+        cut_in = (progress > 0.3) & (progress < 0.5)
+        columns['cut_in_flag'] = cut_in.astype(np.int8)
+        columns['lead_distance_m'] = np.where(cut_in, 15.0, 35.0)
     
-    return base_row
+    # Write all rows in one vectorized call
+    pd.DataFrame(columns, columns=fieldnames).to_csv(csvfile, index=False, lineterminator='\r\n')
 
 def create_dataset(scenario_info, output_dir):
     """Create a single dataset."""
@@ -343,37 +448,25 @@ def create_dataset(scenario_info, output_dir):
     print(f"\n📦 Creating dataset: {name}")
     print(f"   Scenario: {scenario}, Frames: {num_frames}")
     
-    # Create temporary directory
-    temp_dir = Path("temp_dataset")
-    temp_dir.mkdir(exist_ok=True)
-    frames_dir = temp_dir / "frames"
-    frames_dir.mkdir(exist_ok=True)
-    
-    # Generate frames
-    print("   Generating frames...")
-    for i in range(1, num_frames + 1):
-        frame_path = frames_dir / f"frame_{i:06d}.jpg"
-        create_frame(frame_path, i, num_frames, scenario)
-        if i % 50 == 0:
-            print(f"     {i}/{num_frames} frames")
-    
-    # Generate telemetry
-    print("   Generating telemetry...")
-    telemetry_path = temp_dir / "telemetry.csv"
-    create_telemetry(telemetry_path, num_frames, scenario)
-    
-    # Create ZIP
+    # Write frames and telemetry straight into the ZIP (no temp directory)
     output_path = output_dir / f"{scenario}.zip"
-    print("   Creating ZIP file...")
     with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for file_path in temp_dir.rglob('*'):
-            if file_path.is_file():
-                arcname = file_path.relative_to(temp_dir)
-                zipf.write(file_path, arcname)
-    
-    # Cleanup
-    import shutil
-    shutil.rmtree(temp_dir)
+        # Generate frames (independent, rendered across all cores)
+        print("   Generating frames...")
+        frame_args = [(i, num_frames, scenario) for i in range(1, num_frames + 1)]
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            frames = executor.map(_render_one, frame_args, chunksize=8)
+            for i, jpeg_bytes in enumerate(frames, 1):
+                zipf.writestr(f"frames/frame_{i:06d}.jpg", jpeg_bytes)
+                if i % 50 == 0:
+                    print(f"     {i}/{num_frames} frames")
+        
+        # Generate telemetry
+        print("   Generating telemetry...")
+        telemetry_info = zipfile.ZipInfo('telemetry.csv', date_time=time.localtime()[:6])
+        telemetry_info.compress_type = zipfile.ZIP_DEFLATED
+        with zipf.open(telemetry_info, 'w') as raw, io.TextIOWrapper(raw, newline='') as csvfile:
+            create_telemetry(csvfile, num_frames, scenario)
     
     size_mb = os.path.getsize(output_path) / 1024 / 1024
     print(f"   ✓ Created: {output_path.name} ({size_mb:.2f} MB)")
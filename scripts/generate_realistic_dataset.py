@@ -4,11 +4,17 @@ Creates video frames and event annotations for testing.
 """
 import os
 import json
-import random
-import shutil
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
+import pandas as pd
+
+from jpeg_encoding import encode_jpeg
+
 
 # Realistic driving scenarios
 SCENARIOS = [
@@ -80,35 +86,133 @@ SCENARIOS = [
 ]
 
 
-def create_frame(frame_num, scenario, total_frames, event_active=False):
-    """Create a single video frame with scenario visualization."""
-    # Create image
-    width, height = 1280, 720
-    img = Image.new('RGB', (width, height), color=(50, 50, 60))
-    draw = ImageDraw.Draw(img)
+def _line_offsets(dx, dy):
+    """Pixel offsets ImageDraw.line covers for a 1px line from (0, 0) to (dx, dy)."""
+    mask = Image.new('1', (dx + 1, dy + 1))
+    ImageDraw.Draw(mask).line([0, 0, dx, dy], fill=1)
+    return np.nonzero(np.asarray(mask))
+
+
+# Rain streak shape: a 1px line from (x, y) to (x + 2, y + 10)
+RAIN_STREAK = _line_offsets(2, 10)
+
+
+def stamp_rain(arr, xs, ys, color):
+    """Stamp a rain streak at every (x, y) start point with one indexed write."""
+    offset_y, offset_x = RAIN_STREAK
+    py = ys[:, None] + offset_y
+    px = xs[:, None] + offset_x
+    inside = (py < arr.shape[0]) & (px < arr.shape[1])
+    arr[py[inside], px[inside]] = color
+
+
+# Rainy frames cycle through this many precomputed streak patterns
+RAIN_TEMPLATE_COUNT = 8
+
+
+FRAME_WIDTH, FRAME_HEIGHT = 1280, 720
+
+
+def _load_hud_fonts():
+    """HUD fonts: DejaVu when installed, else PIL's built-in bitmap font."""
+    try:
+        font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 20)
+        small_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 16)
+    except OSError:
+        font = ImageFont.load_default()
+        small_font = ImageFont.load_default()
+    return font, small_font
+
+
+# Loaded once per process rather than per frame
+_HUD_FONT, _SMALL_FONT = _load_hud_fonts()
+
+
+@lru_cache(maxsize=None)
+def rain_pixels(template, drops):
+    """
+    Pixel coordinates of `drops` rain streaks, built once per process.
+    
+    Returned as (rows, cols) index arrays so a frame is painted by
+    touching only the streak pixels, not by scanning a full-frame mask.
+    """
+    rng = np.random.default_rng(template)
+    mask = np.zeros((FRAME_HEIGHT, FRAME_WIDTH), dtype=bool)
+    xs = rng.integers(0, FRAME_WIDTH + 1, drops)
+    ys = rng.integers(0, FRAME_HEIGHT + 1, drops)
+    stamp_rain(mask, xs, ys, True)
+    rows, cols = np.nonzero(mask)
+    rows.flags.writeable = False
+    cols.flags.writeable = False
+    return rows, cols
+
+
+# Night tint: frames are blended 30% towards this color
+NIGHT_TINT = np.array([10, 10, 20])
+
+
+@lru_cache(maxsize=None)
+def build_background(weather):
+    """
+    Static road, lane markings and horizon shared by every frame, built once per process.
+    
+    Night backgrounds are pre-darkened, so the tint costs one pass per
+    process instead of a full-frame blend per frame.
+    """
+    width, height = FRAME_WIDTH, FRAME_HEIGHT
+    arr = np.empty((height, width, 3), dtype=np.uint8)
+    arr[:] = (50, 50, 60)
     
     # Draw road
-    road_y = height * 0.6
-    draw.rectangle([0, road_y, width, height], fill=(40, 40, 45))
+    road_top = int(height * 0.6)
+    arr[road_top:] = (40, 40, 45)
+    
+    # Draw lane markings (one strided slice covers every dash)
+    marking_top = int(height * 0.6 + height * 0.15)
+    marking_bottom = int(height * 0.6 + height * 0.17)
+    dash_columns = (np.arange(width) % 100) <= 50
+    arr[marking_top:marking_bottom + 1, dash_columns] = (200, 200, 200)
     
-    # Draw lane markings
-    for i in range(0, width, 100):
-        draw.rectangle([i, road_y + height * 0.15, i + 50, road_y + height * 0.17], fill=(200, 200, 200))
+    # Draw horizon (3px wide)
+    arr[road_top - 1:road_top + 2] = (100, 100, 110)
     
-    # Draw horizon
-    draw.line([(0, road_y), (width, road_y)], fill=(100, 100, 110), width=3)
+    if weather == "night":
+        # Darken the image slightly for night effect (same truncation as Image.blend)
+        arr = (arr + 0.3 * (NIGHT_TINT - arr)).astype(np.uint8)
+    
+    arr.flags.writeable = False
+    return arr
+
+
+@lru_cache(maxsize=None)
+def frame_arena():
+    """
+    Scratch pixel buffer reused by every frame this process renders.
+    
+    Image.fromarray copies out of it, so reuse is safe and saves a
+    full-frame allocation per frame.
+    """
+    return np.empty((FRAME_HEIGHT, FRAME_WIDTH, 3), dtype=np.uint8)
+
+
+def create_frame(frame_num, scenario, total_frames, event_active=False):
+    """Create a single video frame with scenario visualization."""
+    # Start from a copy of the static background (in the per-process
+    # arena); rain is filled straight into the pixel buffer and the rest
+    # is drawn with PIL after wrapping it.
+    width, height = FRAME_WIDTH, FRAME_HEIGHT
+    road_y = height * 0.6
+    arr = frame_arena()
+    np.copyto(arr, build_background(scenario["weather"]))
     
     # Add weather effects
     if scenario["weather"] == "rain":
-        for _ in range(200):
-            x = random.randint(0, width)
-            y = random.randint(0, height)
-            draw.line([(x, y), (x + 2, y + 10)], fill=(150, 150, 200), width=1)
-    elif scenario["weather"] == "night":
-        # Darken the image slightly for night effect
-        img = Image.blend(img, Image.new('RGB', (width, height), color=(10, 10, 20)), 0.3)
-        draw = ImageDraw.Draw(img)
-        
+        arr[rain_pixels(frame_num % RAIN_TEMPLATE_COUNT, 200)] = (150, 150, 200)
+    
+    img = Image.fromarray(arr)
+    draw = ImageDraw.Draw(img)
+    
+    if scenario["weather"] == "night":
         # Add headlight beams
         for i in range(3):
             beam_x = width//2 + (i - 1) * 100
@@ -147,12 +251,7 @@ def create_frame(frame_num, scenario, total_frames, event_active=False):
                 draw.rectangle([lead_x + 15, lead_y - 10, lead_x + 30, lead_y], fill=(255, 0, 0))
     
     # Add HUD overlay
-    try:
-        font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 20)
-        small_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 16)
-    except:
-        font = ImageFont.load_default()
-        small_font = ImageFont.load_default()
+    font, small_font = _HUD_FONT, _SMALL_FONT
     
     # Speed indicator
     speed_kmh = int(scenario["ego_speed_mps"] * 3.6)
@@ -170,9 +269,52 @@ def create_frame(frame_num, scenario, total_frames, event_active=False):
     return img
 
 
+def _render_frame(args):
+    """Process-pool worker: render and save one frame, returning its JPEG bytes."""
+    path, frame_num, scenario, total_frames, event_active = args
+    img = create_frame(frame_num, scenario, total_frames, event_active)
+    jpeg_bytes = encode_jpeg(img, 85)
+    with open(path, 'wb') as f:
+        f.write(jpeg_bytes)
+    return jpeg_bytes
+
+
+def scenario_seed(name):
+    """Stable RNG seed for a scenario (hash() of a str varies between processes)."""
+    return zlib.crc32(name.encode())
+
+
+def write_dataset_zip(dataset_path, zip_path, file_data=None):
+    """
+    ZIP (DEFLATE) a dataset folder with paths relative to it.
+    
+    file_data maps file paths to contents already in memory, which are not
+    read back from disk.
+    """
+    file_data = file_data or {}
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for dirpath, dirnames, filenames in os.walk(dataset_path):
+            dirnames.sort()
+            # Directory entries (e.g. frames/), as shutil.make_archive writes them
+            for name in dirnames:
+                path = os.path.join(dirpath, name)
+                zipf.write(path, os.path.relpath(path, dataset_path))
+            for name in sorted(filenames):
+                path = os.path.join(dirpath, name)
+                arcname = os.path.relpath(path, dataset_path)
+                data = file_data.get(path)
+                if data is None:
+                    zipf.write(path, arcname)
+                else:
+                    # Same entry metadata as zipf.write, without re-reading the file
+                    zipf.writestr(zipfile.ZipInfo.from_file(path, arcname), data,
+                                  compress_type=zipfile.ZIP_DEFLATED)
+
+
 def generate_dataset(output_dir, scenario):
     """Generate a complete dataset for a scenario."""
-    dataset_name = f"{scenario['name'].replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    created_at = datetime.now()
+    dataset_name = f"{scenario['name'].replace(' ', '_')}_{created_at.strftime('%Y%m%d_%H%M%S')}"
     dataset_path = os.path.join(output_dir, dataset_name)
     frames_path = os.path.join(dataset_path, "frames")
     
@@ -180,29 +322,41 @@ def generate_dataset(output_dir, scenario):
     
     # Generate frames
     total_frames = scenario["frame_range"][1] + 50
-    events = []
+    rng = np.random.default_rng(scenario_seed(scenario["name"]))
     
     print(f"Generating {total_frames} frames for '{scenario['name']}'...")
     
-    for frame_num in range(total_frames):
-        event_active = scenario["frame_range"][0] <= frame_num <= scenario["frame_range"][1]
-        
-        # Create and save frame
-        img = create_frame(frame_num, scenario, total_frames, event_active)
-        img.save(os.path.join(frames_path, f"frame_{frame_num:04d}.jpg"), quality=85)
-        
-        # Record event
-        if event_active and frame_num % 20 == 0:  # Event every 20 frames
-            events.append({
-                "frame_number": frame_num,
-                "event_type": scenario["event_type"],
-                "severity": scenario["severity"],
-                "ego_speed_mps": scenario["ego_speed_mps"] + random.uniform(-1, 1),
-                "road_type": scenario["road_type"],
-                "weather": scenario["weather"],
-                "lead_distance_m": scenario["lead_distance_m"] + random.uniform(-2, 2),
-                "cut_in_flag": scenario["cut_in_flag"]
-            })
+    # Create and save frames (independent, rendered across all cores)
+    frame_args = [
+        (os.path.join(frames_path, f"frame_{frame_num:04d}.jpg"), frame_num, scenario, total_frames,
+         scenario["frame_range"][0] <= frame_num <= scenario["frame_range"][1])
+        for frame_num in range(total_frames)
+    ]
+    # Workers also hand back the JPEG bytes so the ZIP step can reuse them
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        frame_data = dict(zip(
+            (args[0] for args in frame_args),
+            executor.map(_render_frame, frame_args, chunksize=8)
+        ))
+    
+    # Record events (every 20 frames of the event window)
+    first, last = scenario["frame_range"]
+    event_frames = [frame_num for frame_num in range(first, last + 1) if frame_num % 20 == 0]
+    speed_jitter = rng.uniform(-1, 1, len(event_frames)).tolist()
+    lead_jitter = rng.uniform(-2, 2, len(event_frames)).tolist()
+    events = [
+        {
+            "frame_number": frame_num,
+            "event_type": scenario["event_type"],
+            "severity": scenario["severity"],
+            "ego_speed_mps": scenario["ego_speed_mps"] + speed_delta,
+            "road_type": scenario["road_type"],
+            "weather": scenario["weather"],
+            "lead_distance_m": scenario["lead_distance_m"] + lead_delta,
+            "cut_in_flag": scenario["cut_in_flag"]
+        }
+        for frame_num, speed_delta, lead_delta in zip(event_frames, speed_jitter, lead_jitter)
+    ]
     
     # Create metadata
     metadata = {
@@ -211,33 +365,37 @@ def generate_dataset(output_dir, scenario):
         "total_frames": total_frames,
         "fps": 10,
         "duration_seconds": total_frames / 10,
-        "upload_date": datetime.now().isoformat(),
+        "upload_date": created_at.isoformat(),
         "events": events[:scenario["num_events"]]  # Limit number of events
     }
     
     with open(os.path.join(dataset_path, "metadata.json"), "w") as f:
         json.dump(metadata, f, indent=2)
     
-    # Create telemetry.csv with exact required fields
+    # Create telemetry.csv with exact required fields (whole columns at once)
     telemetry_path = os.path.join(dataset_path, "telemetry.csv")
-    with open(telemetry_path, "w") as f:
-        f.write("frame_id,timestamp,ego_speed_mps,ego_yaw,road_type,weather,lead_distance_m,cut_in_flag,pedestrian_flag,brake_flag\n")
-        for i in range(total_frames):
-            frame_id = f"frame_{i:06d}"
-            timestamp = round(i / 10.0, 1)  # 10 fps
-            speed = scenario["ego_speed_mps"] + random.uniform(-0.5, 0.5)
-            ego_yaw = 0.0  # Straight driving
-            road_type = scenario["road_type"]
-            weather = scenario["weather"]
-            lead_distance = scenario["lead_distance_m"] + random.uniform(-2, 2)
-            
-            # Determine flags based on event type and frame range
-            event_active = scenario["frame_range"][0] <= i <= scenario["frame_range"][1]
-            cut_in_flag = 1 if (event_active and scenario["event_type"] == "cut_in") else 0
-            pedestrian_flag = 1 if (event_active and scenario["event_type"] == "pedestrian") else 0
-            brake_flag = 1 if (event_active and scenario["event_type"] == "emergency_brake") else 0
-            
-            f.write(f"{frame_id},{timestamp},{speed:.2f},{ego_yaw},{road_type},{weather},{lead_distance:.1f},{cut_in_flag},{pedestrian_flag},{brake_flag}\n")
+    i = np.arange(total_frames)
+    speed = scenario["ego_speed_mps"] + rng.uniform(-0.5, 0.5, total_frames)
+    lead_distance = scenario["lead_distance_m"] + rng.uniform(-2, 2, total_frames)
+    
+    # Determine flags based on event type and frame range
+    event_active = (i >= scenario["frame_range"][0]) & (i <= scenario["frame_range"][1])
+    no_flag = np.zeros(total_frames, dtype=np.int8)
+    event_flag = event_active.astype(np.int8)
+    
+    telemetry = pd.DataFrame({
+        "frame_id": [f"frame_{n:06d}" for n in range(total_frames)],
+        "timestamp": np.char.mod("%.1f", i / 10.0),  # 10 fps
+        "ego_speed_mps": np.char.mod("%.2f", speed),
+        "ego_yaw": "0.0",  # Straight driving
+        "road_type": scenario["road_type"],
+        "weather": scenario["weather"],
+        "lead_distance_m": np.char.mod("%.1f", lead_distance),
+        "cut_in_flag": event_flag if scenario["event_type"] == "cut_in" else no_flag,
+        "pedestrian_flag": event_flag if scenario["event_type"] == "pedestrian" else no_flag,
+        "brake_flag": event_flag if scenario["event_type"] == "emergency_brake" else no_flag
+    })
+    telemetry.to_csv(telemetry_path, index=False, lineterminator="\n")
     
     print(f"✅ Generated dataset: {dataset_name}")
     print(f"   - {total_frames} frames")
@@ -247,7 +405,7 @@ def generate_dataset(output_dir, scenario):
     # Create ZIP file
     zip_path = f"{dataset_path}.zip"
     print(f"📦 Creating ZIP file...")
-    shutil.make_archive(dataset_path, 'zip', dataset_path)
+    write_dataset_zip(dataset_path, zip_path, frame_data)
     print(f"✅ ZIP created: {os.path.basename(zip_path)}")
     
     return dataset_path, zip_path
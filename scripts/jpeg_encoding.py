@@ -0,0 +1,24 @@
+"""
+Shared JPEG encoding for the dataset generator scripts.
+Uses PyTurboJPEG when it is installed, Pillow otherwise.
+"""
+import io
+import numpy as np
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_420
+    _turbo_jpeg = TurboJPEG()
+except (ImportError, RuntimeError, OSError):
+    # PyTurboJPEG or the libturbojpeg shared library is not installed
+    _turbo_jpeg = None
+
+
+def encode_jpeg(img, quality):
+    """JPEG-encode an RGB image, via PyTurboJPEG when it is installed."""
+    if _turbo_jpeg is not None:
+        return _turbo_jpeg.encode(np.asarray(img), quality=quality,
+                                  pixel_format=TJPF_RGB, jpeg_subsample=TJSAMP_420)
+    buf = io.BytesIO()
+    # Baseline 4:2:0 encode, no extra Huffman-optimization pass
+    img.save(buf, 'JPEG', quality=quality, subsampling=2, optimize=False, progressive=False)
+    return buf.getvalue()